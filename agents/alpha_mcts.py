@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from collections import OrderedDict
 import math
 import random
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -13,31 +13,46 @@ from rl.action_space import GlobalActionSpace
 from rl.encode import FeatureEncoder
 from rl.model import SatellitesPolicyValueNet
 
+# (legal action indices, priors over them, value for the side to move); the
+# value is None for forced positions, which are never sent to the network.
+EvalEntry = Tuple[np.ndarray, np.ndarray, Optional[float]]
+
+
+# Shared by every unexpanded node; zero-length, so nothing can write into them.
+_EMPTY_I32 = np.zeros(0, dtype=np.int32)
+_EMPTY_F32 = np.zeros(0, dtype=np.float32)
+
 
-@dataclass
 class AlphaNode:
-    player_to_move: int
-    priors: Dict[int, float] = field(default_factory=dict)
-    visit_count: Dict[int, int] = field(default_factory=dict)
-    value_sum: Dict[int, float] = field(default_factory=dict)
-    children: Dict[int, "AlphaNode"] = field(default_factory=dict)
-    expanded: bool = False
-    visits: int = 0
-
-    def q(self, action_idx: int) -> float:
-        n = self.visit_count.get(action_idx, 0)
-        if n <= 0:
-            return 0.0
-        return self.value_sum.get(action_idx, 0.0) / float(n)
+    """Search node with per-edge statistics stored as dense arrays.
+
+    Slot ``i`` of ``P``/``N``/``W``/``children`` refers to the global action
+    index ``actions[i]``.
+    """
 
-    def u(self, action_idx: int, c_puct: float) -> float:
-        n = self.visit_count.get(action_idx, 0)
-        p = self.priors.get(action_idx, 0.0)
-        return c_puct * p * math.sqrt(max(1.0, float(self.visits))) / (1.0 + float(n))
+    __slots__ = ("player_to_move", "actions", "P", "N", "W", "children", "expanded", "visits")
 
-    def best_action(self, c_puct: float) -> int:
-        assert self.priors, "best_action called on empty node"
-        return max(self.priors.keys(), key=lambda a: self.q(a) + self.u(a, c_puct))
+    def __init__(self, player_to_move: int) -> None:
+        self.player_to_move = player_to_move
+        self.actions: np.ndarray = _EMPTY_I32
+        self.P: np.ndarray = _EMPTY_F32
+        self.N: np.ndarray = _EMPTY_I32
+        self.W: np.ndarray = _EMPTY_F32
+        self.children: List[Optional[AlphaNode]] = []
+        self.expanded = False
+        self.visits = 0
+
+    @property
+    def visit_count(self) -> Dict[int, int]:
+        return dict(zip(self.actions.tolist(), self.N.tolist()))
+
+    def best_slot(self, c_puct: float) -> int:
+        assert self.actions.size, "best_slot called on empty node"
+        # Fold the parent-level factor into one scalar before touching the arrays.
+        c_sqrt_n = c_puct * math.sqrt(max(1, self.visits))
+        n = self.N
+        score = self.W / np.maximum(n, 1) + c_sqrt_n * self.P / (1 + n)
+        return int(score.argmax())
 
 
 class AlphaMCTS:
@@ -55,8 +70,32 @@ class AlphaMCTS:
         dirichlet_eps: float = 0.25,
         device: str = "cpu",
         seed: int | None = None,
+        batch_size: int = 8,
+        virtual_loss: int = 1,
+        tt_size: int = 1 << 16,
+        reuse_tree: bool = True,
+        half_precision: bool | None = None,
+        compile_model: bool = False,
     ):
         self.model = model
+        self.model.eval()
+        # Constructor settings (minus the seed), so worker processes can build an equivalent searcher.
+        self._search_kwargs = dict(
+            simulations=simulations,
+            c_puct=c_puct,
+            dirichlet_alpha=dirichlet_alpha,
+            dirichlet_eps=dirichlet_eps,
+            device=device,
+            batch_size=batch_size,
+            virtual_loss=virtual_loss,
+            tt_size=tt_size,
+            reuse_tree=reuse_tree,
+            half_precision=half_precision,
+            compile_model=compile_model,
+        )
+        # Inference entry point; optionally a compiled graph sharing the model's parameters.
+        self._net = torch.compile(model, mode="reduce-overhead", fullgraph=True) if compile_model else model
+        self._compiled = compile_model
         self.action_space = action_space
         self.encoder = encoder
         self.simulations = simulations
@@ -65,95 +104,352 @@ class AlphaMCTS:
         self.dirichlet_eps = dirichlet_eps
         self.device = torch.device(device)
         self.rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed)
+        self._alpha_cache: Dict[int, np.ndarray] = {}
+        self.batch_size = max(1, int(batch_size))
+        self.virtual_loss = virtual_loss
+        self.tt_size = tt_size
+        self._tt: "OrderedDict[int, EvalEntry]" = OrderedDict()
+        # (cache key, legal indices) of positions encoded into the staging buffer.
+        self._queued: List[Tuple[int, np.ndarray]] = []
+        self.reuse_tree = reuse_tree
+        # Subtree under the last chosen action, kept for the next search.
+        self._root: Optional[AlphaNode] = None
+        self._root_key: Optional[int] = None
+        # Reusable model inputs: a (pinned, on CUDA) host staging buffer and its device twin.
+        pin = self.device.type == "cuda" and torch.cuda.is_available()
+        self._host_buf = torch.empty((self.batch_size, encoder.feature_dim), dtype=torch.float32, pin_memory=pin)
+        self._host_np = self._host_buf.numpy()
+        if self.device.type == "cpu":
+            self._dev_buf = self._host_buf
+        else:
+            self._dev_buf = torch.empty_like(self._host_buf, device=self.device)
+        # Reduced-precision inference via autocast: FP16 on CUDA, BF16 on CPU. The
+        # model itself stays FP32 so the training graph is untouched. Defaults to on for CUDA.
+        if half_precision is None:
+            half_precision = self.device.type == "cuda"
+        self._amp_dtype = None
+        if half_precision:
+            self._amp_dtype = torch.float16 if self.device.type == "cuda" else torch.bfloat16
+        # H2D copies go through a side stream that the compute stream waits on.
+        self._copy_stream = torch.cuda.Stream(device=self.device) if pin else None
 
-    @torch.no_grad()
-    def _policy_value(self, game: SatellitesGame) -> Tuple[np.ndarray, float]:
-        x = torch.from_numpy(self.encoder.encode(game)).float().unsqueeze(0).to(self.device)
-        logits, value = self.model(x)
-        return logits.squeeze(0).detach().cpu().numpy(), float(value.item())
-
-    def _expand(self, node: AlphaNode, game: SatellitesGame, add_noise: bool = False) -> float:
-        legal = self.action_space.legal_action_indices(game)
-        if not legal:
-            node.expanded = True
-            node.priors = {}
-            return 0.0
+    @torch.inference_mode()
+    def _forward(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Run the model on the first ``k`` rows of the input buffer."""
+        # A compiled graph always sees the full buffer so it is specialised for one shape only.
+        rows = self.batch_size if self._compiled else k
+        x = self._dev_buf[:rows]
+        if self._copy_stream is not None:
+            with torch.cuda.stream(self._copy_stream):
+                x[:k].copy_(self._host_buf[:k], non_blocking=True)
+            torch.cuda.current_stream(self.device).wait_stream(self._copy_stream)
+        elif self._dev_buf is not self._host_buf:
+            x[:k].copy_(self._host_buf[:k], non_blocking=True)
+        with torch.autocast(self.device.type, dtype=self._amp_dtype, enabled=self._amp_dtype is not None):
+            logits, value = self._net(x)
+        return logits[:k].detach().float().cpu().numpy(), value[:k].detach().float().cpu().numpy()
 
-        logits, value = self._policy_value(game)
-        legal_logits = logits[legal]
-        legal_logits = legal_logits - np.max(legal_logits)
-        probs = np.exp(legal_logits)
-        denom = float(np.sum(probs))
-        if denom <= 0.0:
-            probs = np.ones_like(probs) / float(len(probs))
+    @staticmethod
+    def _softmax_legal(logits: np.ndarray, legal: np.ndarray) -> np.ndarray:
+        # logits[legal] is a fresh array, so the softmax can run in place on it.
+        lp = logits[legal]
+        np.subtract(lp, lp.max(), out=lp)
+        np.exp(lp, out=lp)
+        total = lp.sum()
+        if total <= 0.0:
+            lp.fill(1.0 / lp.size)
         else:
-            probs = probs / denom
+            lp /= total
+        return lp
 
-        if add_noise and len(legal) > 1:
-            noise = np.random.dirichlet([self.dirichlet_alpha] * len(legal))
-            probs = (1.0 - self.dirichlet_eps) * probs + self.dirichlet_eps * noise
+    def _store(self, key: int, entry: EvalEntry) -> EvalEntry:
+        self._tt[key] = entry
+        if len(self._tt) > self.tt_size:
+            self._tt.popitem(last=False)
+        return entry
 
-        node.priors = {a: float(p) for a, p in zip(legal, probs)}
-        node.visit_count = {a: 0 for a in legal}
-        node.value_sum = {a: 0.0 for a in legal}
-        node.expanded = True
+    def clear_cache(self) -> None:
+        """Drop cached evaluations, e.g. after the model weights changed."""
+        self._tt.clear()
+
+    @staticmethod
+    def _feature_key(feat: np.ndarray) -> int:
+        return hash(feat.tobytes())
+
+    def _stage(self, game: SatellitesGame) -> Union[EvalEntry, int]:
+        """Look ``game`` up in the evaluation cache or queue it for the next forward pass.
+
+        Returns the cached ``(legal, priors, value)`` entry, or the staging row the
+        position was encoded into. Entries are keyed by a hash of the encoded
+        features, i.e. of the exact network input.
+        """
+        # Encode straight into the next free staging row; a cache hit leaves it free.
+        feat = self.encoder.encode(game, out=self._host_np[len(self._queued)])
+        key = self._feature_key(feat)
+        hit = self._tt.get(key)
+        if hit is not None:
+            self._tt.move_to_end(key)
+            return hit
+        legal = np.asarray(self.action_space.legal_action_indices(game), dtype=np.int32)
+        if not legal.size:
+            return self._store(key, (legal, np.zeros(0, dtype=np.float32), 0.0))
+        if legal.size == 1:
+            return self._store(key, (legal, np.ones(1, dtype=np.float32), None))
+        self._queued.append((key, legal))
+        return len(self._queued) - 1
+
+    def _flush(self) -> List[EvalEntry]:
+        """Evaluate every queued position in one forward pass; entries are indexed by row."""
+        queued, self._queued = self._queued, []
+        if not queued:
+            return []
+        logits, values = self._forward(len(queued))
+        return [
+            self._store(key, (legal, self._softmax_legal(logits[row], legal), float(values[row])))
+            for row, (key, legal) in enumerate(queued)
+        ]
+
+    def _evaluate(self, game: SatellitesGame) -> EvalEntry:
+        staged = self._stage(game)
+        if isinstance(staged, int):
+            return self._flush()[staged]
+        return staged
+
+    def _expand(self, node: AlphaNode, game: SatellitesGame, add_noise: bool = False) -> Optional[float]:
+        legal, probs, value = self._evaluate(game)
+        self._set_priors(node, legal, probs, add_noise)
         return value
 
+    def _set_priors(self, node: AlphaNode, legal: np.ndarray, probs: np.ndarray, add_noise: bool) -> None:
+        node.expanded = True
+        k = len(legal)
+        if not k:
+            return
+        if add_noise:
+            probs = self._with_noise(probs)
+
+        node.actions = legal
+        # Always a private copy: cached priors must survive edits to node.P.
+        node.P = probs.astype(np.float32)
+        node.N = np.zeros(k, dtype=np.int32)
+        node.W = np.zeros(k, dtype=np.float32)
+        node.children = [None] * k
+
+    def _with_noise(self, probs: np.ndarray) -> np.ndarray:
+        k = len(probs)
+        if k <= 1:
+            return probs
+        alpha = self._alpha_cache.get(k)
+        if alpha is None:
+            alpha = self._alpha_cache[k] = np.full(k, self.dirichlet_alpha, dtype=np.float64)
+        noise = self._np_rng.dirichlet(alpha)
+        # probs may be a cached evaluation, so only the product is updated in place.
+        mixed = probs * (1.0 - self.dirichlet_eps)
+        mixed += self.dirichlet_eps * noise
+        return mixed
+
+    def _reusable_root(self, root_game: SatellitesGame) -> Optional[AlphaNode]:
+        """Return the subtree kept from the previous move if it matches ``root_game``."""
+        node, key = self._root, self._root_key
+        self._root = self._root_key = None
+        if node is None or not node.actions.size:
+            return None
+        if key != self._feature_key(self.encoder.encode(root_game, out=self._host_np[0])):
+            return None
+        # A kept child never had noise mixed in, so its own priors and legal
+        # actions stand in for a fresh evaluation of the position.
+        node.P = self._with_noise(node.P).astype(np.float32)
+        return node
+
     def _terminal_value_for_current_player(self, game: SatellitesGame) -> float:
         if game.winner is None or game.winner == -1:
             return 0.0
         return 1.0 if game.winner == game.turn else -1.0
 
+    def _backup(self, path: List[Tuple[AlphaNode, int]], value: float) -> None:
+        # Reverts the virtual loss applied during descent while adding the real result.
+        vloss = self.virtual_loss
+        dn = 1 - vloss
+        cur = value
+        for parent, slot in reversed(path):
+            parent.visits += dn
+            parent.N[slot] += dn
+            parent.W[slot] += cur + vloss
+            cur = -cur
+
+    def _descend(
+        self,
+        node: AlphaNode,
+        game: SatellitesGame,
+        path: List[Tuple[AlphaNode, int]],
+        tokens: List[Any],
+    ) -> AlphaNode:
+        """Walk from ``node`` to a leaf, applying moves to ``game`` and virtual loss to edges.
+
+        The ``(node, slot)`` edges taken are appended to ``path`` and the undo
+        tokens that restore ``game`` are appended to ``tokens``.
+        """
+        c_puct = self.c_puct
+        vloss = self.virtual_loss
+        index_to_action = self.action_space.index_to_action
+        apply_with_undo = game.apply_action_with_undo
+        while node.expanded and node.actions.size and game.state != "GAME_OVER":
+            slot = node.best_slot(c_puct)
+            ok, token, _ = apply_with_undo(index_to_action[node.actions[slot]])
+            if not ok:
+                game.undo_action(token)
+                node.P[slot] = 0.0
+                continue
+            tokens.append(token)
+            # Virtual loss steers the remaining descents of this batch elsewhere.
+            node.visits += vloss
+            node.N[slot] += vloss
+            node.W[slot] -= vloss
+            path.append((node, slot))
+            child = node.children[slot]
+            if child is None:
+                child = node.children[slot] = AlphaNode(player_to_move=int(game.turn))
+                return child
+            node = child
+        return node
+
     def search(self, root_game: SatellitesGame) -> Tuple[AlphaNode, np.ndarray]:
-        root = AlphaNode(player_to_move=int(root_game.turn))
-        self._expand(root, root_game, add_noise=True)
-
-        for _ in range(self.simulations):
-            game = root_game.clone()
-            node = root
-            path: list[tuple[AlphaNode, int]] = []
-
-            while node.expanded and node.priors and game.state != "GAME_OVER":
-                action_idx = node.best_action(self.c_puct)
-                action = self.action_space.from_index(action_idx)
-                ok = game.apply_action(action)
-                if not ok:
-                    node.priors[action_idx] = 0.0
-                    continue
-                path.append((node, action_idx))
-                child = node.children.get(action_idx)
-                if child is None:
-                    child = AlphaNode(player_to_move=int(game.turn))
-                    node.children[action_idx] = child
-                    node = child
-                    break
-                node = child
+        root = self._reusable_root(root_game)
+        if root is None:
+            root = AlphaNode(player_to_move=int(root_game.turn))
+            self._expand(root, root_game, add_noise=True)
 
-            if game.state == "GAME_OVER":
-                value = self._terminal_value_for_current_player(game)
-            else:
-                value = self._expand(node, game, add_noise=False)
+        # One scratch position per search; every descent is unwound with undo tokens.
+        game = root_game.clone()
+        undo_action = game.undo_action
+        done = 0
+        while done < self.simulations:
+            batch = min(self.batch_size, self.simulations - done)
+            done += batch
+            pending: List[Tuple[List[Tuple[AlphaNode, int]], AlphaNode, Union[EvalEntry, int]]] = []
+            staged_by_node: Dict[int, Union[EvalEntry, int]] = {}
+
+            for _ in range(batch):
+                path: List[Tuple[AlphaNode, int]] = []
+                tokens: List[Any] = []
+                node = self._descend(root, game, path, tokens)
+                while True:
+                    if game.state == "GAME_OVER":
+                        self._backup(path, self._terminal_value_for_current_player(game))
+                        break
+                    if node.expanded:
+                        # Expanded node without legal actions.
+                        self._backup(path, 0.0)
+                        break
+                    # Leaves are staged while the scratch game still holds their position;
+                    # a node reached twice in one batch is evaluated once.
+                    staged = staged_by_node.get(id(node))
+                    if staged is None:
+                        staged = self._stage(game)
+                        if not isinstance(staged, int) and staged[2] is None:
+                            # Forced move: expand without the network and keep walking,
+                            # so the value comes from the first real decision below.
+                            self._set_priors(node, staged[0], staged[1], add_noise=False)
+                            node = self._descend(node, game, path, tokens)
+                            continue
+                        staged_by_node[id(node)] = staged
+                    pending.append((path, node, staged))
+                    break
+                for token in reversed(tokens):
+                    undo_action(token)
 
-            cur = value
-            for parent, aidx in reversed(path):
-                parent.visits += 1
-                parent.visit_count[aidx] = parent.visit_count.get(aidx, 0) + 1
-                parent.value_sum[aidx] = parent.value_sum.get(aidx, 0.0) + cur
-                cur = -cur
+            flushed = self._flush()
+            for path, node, staged in pending:
+                legal, probs, value = flushed[staged] if isinstance(staged, int) else staged
+                if not node.expanded:
+                    self._set_priors(node, legal, probs, add_noise=False)
+                self._backup(path, value)
 
         pi = self.action_space.visit_policy(root.visit_count, temperature=1.0)
         return root, pi
 
+    def _keep_subtree(self, root: AlphaNode, root_game: SatellitesGame, action_idx: int) -> None:
+        slots = np.flatnonzero(root.actions == action_idx)
+        child = root.children[int(slots[0])] if slots.size else None
+        if child is None or not child.expanded:
+            return
+        nxt = root_game.clone()
+        if not nxt.apply_action(self.action_space.from_index(action_idx)):
+            return
+        self._root = child
+        self._root_key = self._feature_key(self.encoder.encode(nxt, out=self._host_np[0]))
+
+    def search_root_parallel(
+        self,
+        root_game: SatellitesGame,
+        n_workers: int,
+        temperature: float = 1.0,
+    ) -> Tuple[Dict[int, int], np.ndarray]:
+        """Root parallelisation: independent searches in worker processes.
+
+        Each worker builds a fresh searcher from the model and this searcher's
+        settings and runs a full ``search`` with a distinct seed; root visit
+        counts are summed across the trees. Separate processes sidestep the GIL
+        that serialises the Python tree code. Staging buffers, streams, the
+        evaluation cache and any kept subtree stay in this process.
+        """
+        if n_workers <= 1:
+            root, _ = self.search(root_game)
+            merged = root.visit_count
+            return merged, self.action_space.visit_policy(merged, temperature=temperature)
+
+        self.model.share_memory()
+        seeds = [self.rng.randrange(2**31) for _ in range(n_workers)]
+        ctx = torch.multiprocessing.get_context("spawn")
+        with ctx.Pool(n_workers) as pool:
+            results = pool.map(
+                _root_parallel_worker,
+                [
+                    (self.model, self.action_space.max_move_amount, self._search_kwargs, root_game, seed)
+                    for seed in seeds
+                ],
+            )
+
+        merged: Dict[int, int] = {}
+        for counts in results:
+            for a, n in counts.items():
+                merged[a] = merged.get(a, 0) + n
+        return merged, self.action_space.visit_policy(merged, temperature=temperature)
+
     def select_action(self, root_game: SatellitesGame, temperature: float = 1.0):
         root, _ = self.search(root_game)
         pi = self.action_space.visit_policy(root.visit_count, temperature=temperature)
         if pi.sum() <= 0:
-            legal = root_game.legal_actions()
-            if not legal:
-                raise ValueError("No legal actions from root state.")
-            action = legal[self.rng.randrange(len(legal))]
+            if root.actions.size:
+                action = self.action_space.from_index(int(root.actions[self.rng.randrange(root.actions.size)]))
+            else:
+                legal = root_game.legal_actions()
+                if not legal:
+                    raise ValueError("No legal actions from root state.")
+                action = legal[self.rng.randrange(len(legal))]
             return action, {"policy": pi, "root_visits": 0}
-        action_idx = int(np.random.choice(np.arange(self.action_space.size), p=pi))
+        # Inverse-CDF draw over the non-zero entries only.
+        nz = np.flatnonzero(pi)
+        cdf = np.cumsum(pi[nz])
+        pick = min(int(np.searchsorted(cdf, self._np_rng.random() * cdf[-1], side="right")), nz.size - 1)
+        action_idx = int(nz[pick])
         action = self.action_space.from_index(action_idx)
-        return action, {"policy": pi, "root_visits": int(sum(root.visit_count.values()))}
+        if self.reuse_tree:
+            self._keep_subtree(root, root_game, action_idx)
+        return action, {"policy": pi, "root_visits": int(root.N.sum())}
+
 
+def _root_parallel_worker(
+    args: Tuple[SatellitesPolicyValueNet, int, Dict[str, Any], SatellitesGame, int],
+) -> Dict[int, int]:
+    model, max_move_amount, search_kwargs, root_game, seed = args
+    mcts = AlphaMCTS(
+        model,
+        GlobalActionSpace(max_move_amount=max_move_amount),
+        FeatureEncoder(),
+        seed=seed,
+        **search_kwargs,
+    )
+    root, _ = mcts.search(root_game)
+    return root.visit_count
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import itertools
 import json
 import math
+import multiprocessing
+import pickle
 import random
 import time
 from typing import Any, Dict, List, Optional, Protocol, Tuple
 
+import numpy as np
+
 
 Action = Any
 Player = int
@@ -54,28 +60,105 @@ class MCTSAdapter(Protocol):
     def state_key(self, state: Any) -> Any:
         ...
 
+    def rollout_scores(self, state: Any, player: Player) -> Tuple[List[Action], np.ndarray, np.ndarray]:
+        """Optional fused rollout hook: legal actions with their priors and tactical priorities."""
+
+
+# Shared by every childless node; zero-length, so nothing can write into them.
+_EMPTY_F32 = np.zeros(0, dtype=np.float32)
+_EMPTY_I32 = np.zeros(0, dtype=np.int32)
+_EMPTY_F64 = np.zeros(0, dtype=np.float64)
+
 
-@dataclass
 class Node:
-    parent: Optional["Node"] = None
-    action_from_parent: Optional[Action] = None
-    player_to_move: Player = 0
-    state_key: Any = None
-    visits: int = 0
-    value_sum: float = 0.0
-    child_actions: List[Action] = field(default_factory=list)
-    child_nodes: List["Node"] = field(default_factory=list)
-    child_priors: List[float] = field(default_factory=list)
-    action_to_child_idx: Dict[Action, int] = field(default_factory=dict)
-    untried_actions: Optional[List[Action]] = None
-    untried_priors: Optional[List[float]] = None
+    __slots__ = (
+        "parent",
+        "action_from_parent",
+        "player_to_move",
+        "state_key",
+        "visits",
+        "value_sum",
+        "log_visits",
+        "child_actions",
+        "child_nodes",
+        "child_priors",
+        "child_visits",
+        "child_value_sum",
+        "index_in_parent",
+        "untried_actions",
+        "untried_priors",
+        "untried_head",
+        "tt_entry",
+    )
+
+    def __init__(
+        self,
+        parent: Optional["Node"] = None,
+        action_from_parent: Optional[Action] = None,
+        player_to_move: Player = 0,
+        state_key: Any = None,
+    ) -> None:
+        self.parent = parent
+        self.action_from_parent = action_from_parent
+        self.player_to_move = player_to_move
+        self.state_key = state_key
+        self.visits = 0
+        self.value_sum = 0.0
+        # log(max(1, visits)), refreshed whenever visits changes.
+        self.log_visits = 0.0
+        self.child_actions: List[Action] = []
+        self.child_nodes: List[Node] = []
+        # Per-child statistics kept on the parent as contiguous arrays. Only the first
+        # len(child_nodes) entries are live; capacity grows by doubling.
+        self.child_priors: np.ndarray = _EMPTY_F32
+        self.child_visits: np.ndarray = _EMPTY_I32
+        self.child_value_sum: np.ndarray = _EMPTY_F64
+        self.index_in_parent = -1
+        # Ordered candidate actions, shared with the ordering cache; entries before
+        # untried_head have already been expanded.
+        self.untried_actions: Optional[Tuple[Action, ...]] = None
+        self.untried_priors: Optional[Tuple[float, ...]] = None
+        self.untried_head = 0
+        # This node's [visits, value_sum] list in the transposition table, if any.
+        self.tt_entry: Optional[List[float]] = None
 
     @property
     def value(self) -> float:
         return 0.0 if self.visits == 0 else self.value_sum / self.visits
 
 
+def _ucb_argmax(visits: np.ndarray, value_sum: np.ndarray, log_n: float, c_puct: float) -> int:
+    """Index of the child with the highest UCB1 score; unvisited children win, earliest first."""
+    first = int(visits.argmin())
+    if visits[first] == 0:
+        return first
+    # In-place ufuncs keep this at two temporaries regardless of branching factor.
+    inv_visits = np.reciprocal(visits, dtype=np.float64)
+    scores = np.multiply(inv_visits, log_n)
+    np.sqrt(scores, out=scores)
+    scores *= c_puct
+    inv_visits *= value_sum
+    scores += inv_visits
+    return int(scores.argmax())
+
+
 class MCTS:
+    # Attributes a root-parallel worker searches with; the warm pool is restarted
+    # when any of these (or the adapter's state) differ from when it was forked.
+    _WORKER_SETTINGS = (
+        "c_puct",
+        "rollout_depth",
+        "rollout_greedy_prob",
+        "widening_base",
+        "widening_step",
+        "widening_every",
+        "use_transposition",
+        "virtual_loss",
+        "tt_max_entries",
+        "tt_reuse_visits",
+        "rollouts_per_leaf",
+    )
+
     def __init__(
         self,
         adapter: MCTSAdapter,
@@ -89,6 +172,10 @@ class MCTS:
         widening_every: int = 25,
         use_transposition: bool = True,
         seed: Optional[int] = None,
+        virtual_loss: int = 0,
+        tt_max_entries: int = 1_000_000,
+        tt_reuse_visits: int = 0,
+        rollouts_per_leaf: int = 1,
     ) -> None:
         self.adapter = adapter
         self.iterations = iterations
@@ -99,10 +186,38 @@ class MCTS:
         self.widening_step = widening_step
         self.widening_every = widening_every
         self.use_transposition = use_transposition
+        # Pessimistic visits charged to each edge on the way down and refunded in
+        # backprop, so descents that overlap before backing up spread out.
+        self.virtual_loss = virtual_loss
+        # Transposition tables persist across moves; the oldest entries are dropped
+        # once a table exceeds tt_max_entries.
+        self.tt_max_entries = tt_max_entries
+        # A leaf whose transposition entry already has this many visits backs up the
+        # entry's mean value instead of running a rollout (0 disables).
+        self.tt_reuse_visits = tt_reuse_visits
+        # Playouts averaged per expanded leaf; more than one trades rollout time for a
+        # lower-variance value per selection/expansion cycle.
+        self.rollouts_per_leaf = max(1, rollouts_per_leaf)
         self.tt_stats: Dict[Any, List[float]] = {}
         self.tt_legal: Dict[Any, Tuple[Action, ...]] = {}
         self.tt_ordered: Dict[Any, Tuple[Tuple[Action, ...], Tuple[float, ...]]] = {}
         self.rng = random.Random(seed)
+        # Warm worker processes for select_action_parallel, created on first use.
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
+        self._pool_fingerprint: Optional[Tuple[Any, ...]] = None
+        # Optional adapter hooks, probed once instead of on every rollout step.
+        self._has_evaluate = hasattr(adapter, "evaluate")
+        self._has_action_prior = hasattr(adapter, "action_prior")
+        self._has_tactical_priority = hasattr(adapter, "tactical_priority")
+        self._has_rollout_scores = hasattr(adapter, "rollout_scores")
+        # The stock SatellitesAdapter scores every action 0, which carries no ordering
+        # information; skip the per-action calls entirely in that case.
+        adapter_cls = type(adapter)
+        self._neutral_scoring = (
+            getattr(adapter_cls, "action_prior", None) is SatellitesAdapter.action_prior
+            and getattr(adapter_cls, "tactical_priority", None) is SatellitesAdapter.tactical_priority
+        )
 
     def select_action(self, root_state: Any) -> Tuple[Action, Dict[str, float]]:
         return self._select_action_internal(root_state, max_iterations=self.iterations)
@@ -121,6 +236,118 @@ class MCTS:
             min_iterations=max(1, min_iterations),
         )
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_pool_workers"] = 0
+        state["_pool_fingerprint"] = None
+        return state
+
+    def select_action_parallel(self, root_state: Any, n_workers: int) -> Tuple[Action, Dict[str, float]]:
+        """Root parallelisation: independent trees in forked worker processes.
+
+        Each worker searches ``iterations // n_workers`` times from its own copy
+        of the root with a distinct seed; root child visits are summed across
+        workers and the most visited action wins. Workers stay alive between
+        calls and keep their own transposition tables warm; ``close`` stops them.
+
+        Workers search with a snapshot of this instance taken when the pool was
+        forked. If the adapter (including its weights) or a search setting in
+        ``_WORKER_SETTINGS`` has changed since, the pool is restarted on the next
+        call, which also drops the workers' warm tables. Any other attribute
+        changed after that point is not seen by the workers.
+        """
+        if n_workers <= 1:
+            return self.select_action(root_state)
+        per_worker = max(1, self.iterations // n_workers)
+        return self._root_parallel(root_state, n_workers, per_worker)
+
+    def select_action_parallel_for_time(
+        self,
+        root_state: Any,
+        max_time_s: float,
+        n_workers: int,
+        min_iterations: int = 1,
+    ) -> Tuple[Action, Dict[str, float]]:
+        """Time-budgeted select_action_parallel: every worker searches until the budget runs out.
+
+        In the returned stats, ``iterations`` is the total number of search
+        iterations run across all workers (each runs at least
+        ``min_iterations``). ``root_visits`` sums the merged root child visits,
+        which also count visits seeded from each worker's transposition table,
+        so on repeated searches it can exceed ``iterations``.
+        """
+        if n_workers <= 1:
+            return self.select_action_for_time(root_state, max_time_s, min_iterations)
+        return self._root_parallel(
+            root_state,
+            n_workers,
+            None,
+            max_time_s=max(0.01, max_time_s),
+            min_iterations=max(1, min_iterations),
+        )
+
+    def _root_parallel(
+        self,
+        root_state: Any,
+        n_workers: int,
+        per_worker: Optional[int],
+        max_time_s: Optional[float] = None,
+        min_iterations: int = 1,
+    ) -> Tuple[Action, Dict[str, float]]:
+        seeds = [self.rng.randrange(2**31) for _ in range(n_workers)]
+        pool = self._worker_pool(n_workers)
+        futures = [
+            pool.submit(_root_parallel_worker, root_state, seed, per_worker, max_time_s, min_iterations)
+            for seed in seeds
+        ]
+        results = [f.result() for f in futures]
+
+        merged: Dict[Action, int] = {}
+        iterations = 0
+        for counts, iters_done in results:
+            iterations += iters_done
+            for action, visits in counts:
+                merged[action] = merged.get(action, 0) + visits
+        best_action = max(merged, key=merged.__getitem__)
+        stats = {
+            "root_visits": float(sum(merged.values())),
+            "best_action_visits": float(merged[best_action]),
+            "iterations": float(iterations),
+        }
+        return best_action, stats
+
+    def close(self) -> None:
+        """Shut down the worker processes started by select_action_parallel."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_workers = 0
+            self._pool_fingerprint = None
+
+    def _worker_fingerprint(self) -> Tuple[Any, ...]:
+        """Everything a forked worker copied that decides how it searches."""
+        try:
+            adapter_state: Any = pickle.dumps(self.adapter)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable adapters are tracked by identity only.
+            adapter_state = id(self.adapter)
+        return tuple(getattr(self, name) for name in self._WORKER_SETTINGS) + (adapter_state,)
+
+    def _worker_pool(self, n_workers: int) -> ProcessPoolExecutor:
+        fingerprint = self._worker_fingerprint()
+        if self._pool is None or self._pool_workers != n_workers or self._pool_fingerprint != fingerprint:
+            self.close()
+            self._pool = ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_root_parallel_worker,
+                initargs=(self,),
+            )
+            self._pool_workers = n_workers
+            self._pool_fingerprint = fingerprint
+        return self._pool
+
     def _select_action_internal(
         self,
         root_state: Any,
@@ -129,20 +356,48 @@ class MCTS:
         deadline: Optional[float] = None,
         min_iterations: int = 1,
     ) -> Tuple[Action, Dict[str, float]]:
+        root, iters_done = self._search(
+            root_state,
+            max_iterations=max_iterations,
+            deadline=deadline,
+            min_iterations=min_iterations,
+        )
+        if not root.child_nodes:
+            raise ValueError("No child nodes expanded from root.")
+        best_idx = int(root.child_visits[: len(root.child_nodes)].argmax())
+        best_action = root.child_actions[best_idx]
+        best_child = root.child_nodes[best_idx]
+        stats = {
+            "root_visits": float(root.visits),
+            "best_action_visits": float(best_child.visits),
+            "best_action_value": best_child.value,
+            "iterations": float(iters_done),
+        }
+        return best_action, stats
+
+    def _search(
+        self,
+        root_state: Any,
+        *,
+        max_iterations: Optional[int],
+        deadline: Optional[float] = None,
+        min_iterations: int = 1,
+    ) -> Tuple[Node, int]:
+        if self.use_transposition:
+            self._trim_transposition_tables()
         work_state = self.adapter.clone(root_state)
         root_key = self.adapter.state_key(work_state)
         root = Node(
             player_to_move=self.adapter.current_player(work_state),
             state_key=root_key,
         )
-        if self.use_transposition and root_key in self.tt_stats:
-            s = self.tt_stats[root_key]
-            root.visits = int(s[0])
-            root.value_sum = float(s[1])
+        self._attach_tt_entry(root)
         root.untried_actions, root.untried_priors = self._ordered_actions(work_state, root.player_to_move)
         if not root.untried_actions:
             raise ValueError("No legal actions from root state.")
 
+        reuse_visits = self.tt_reuse_visits
+        rollouts = self.rollouts_per_leaf
         iters_done = 0
         while True:
             if max_iterations is not None and iters_done >= max_iterations:
@@ -150,48 +405,57 @@ class MCTS:
             if deadline is not None and iters_done >= min_iterations and time.perf_counter() >= deadline:
                 break
             node, path_tokens = self._select_and_expand(root, work_state)
-            value = self._simulate_from_clone(work_state, node.player_to_move)
+            entry = node.tt_entry
+            if reuse_visits and entry is not None and entry[0] >= reuse_visits:
+                value = entry[1] / entry[0]
+            elif rollouts == 1:
+                value = self._simulate_from_clone(work_state, node.player_to_move)
+            else:
+                value = sum(
+                    self._simulate_from_clone(work_state, node.player_to_move) for _ in range(rollouts)
+                ) / rollouts
             self._backpropagate(node, value)
             self._undo_tokens(work_state, path_tokens)
             iters_done += 1
-
-        if not root.child_nodes:
-            raise ValueError("No child nodes expanded from root.")
-        best_idx = max(range(len(root.child_nodes)), key=lambda i: root.child_nodes[i].visits)
-        best_action = root.child_actions[best_idx]
-        best_child = root.child_nodes[best_idx]
-        stats = {
-            "root_visits": float(root.visits),
-            "best_action_visits": float(best_child.visits),
-            "best_action_value": best_child.value,
-            "iterations": float(iters_done),
-        }
-        return best_action, stats
+        return root, iters_done
 
     def _select_and_expand(self, node: Node, state: Any) -> Tuple[Node, List[Any]]:
         path_tokens: List[Any] = []
-        while not self.adapter.is_terminal(state):
+        is_terminal = self.adapter.is_terminal
+        apply_with_undo = self.adapter.apply_action_with_undo
+        while not is_terminal(state):
             if node.untried_actions is None:
                 node.untried_actions, node.untried_priors = self._ordered_actions(state, node.player_to_move)
-            total_actions = len(node.child_nodes) + len(node.untried_actions)
+            untried_left = len(node.untried_actions) - node.untried_head
+            total_actions = len(node.child_nodes) + untried_left
             allowed = self.widening_base + (node.visits // self.widening_every) * self.widening_step
-            if node.untried_actions and len(node.child_nodes) < min(total_actions, allowed):
+            if untried_left and len(node.child_nodes) < min(total_actions, allowed):
                 child, token = self._expand(node, state)
                 path_tokens.append(token)
+                if self.virtual_loss:
+                    self._add_virtual_loss(node, child.index_in_parent)
                 return child, path_tokens
             edge_idx, action, child = self._best_ucb_edge(node)
-            success, token = self.adapter.apply_action_with_undo(state, action)
+            success, token = apply_with_undo(state, action)
             if not success:
                 # Defensive: if engine rejects, prune edge and retry.
                 self._remove_child_at(node, edge_idx)
                 continue
             path_tokens.append(token)
+            if self.virtual_loss:
+                self._add_virtual_loss(node, edge_idx)
             node = child
         return node, path_tokens
 
+    def _add_virtual_loss(self, node: Node, idx: int) -> None:
+        node.child_visits[idx] += self.virtual_loss
+        node.child_value_sum[idx] -= self.virtual_loss
+
     def _expand(self, node: Node, state: Any) -> Tuple[Node, Any]:
-        action = node.untried_actions.pop(0)
-        prior = node.untried_priors.pop(0) if node.untried_priors else 0.0
+        head = node.untried_head
+        action = node.untried_actions[head]
+        prior = node.untried_priors[head] if node.untried_priors else 0.0
+        node.untried_head = head + 1
         success, token = self.adapter.apply_action_with_undo(state, action)
         if not success:
             # Defensive fallback: treat as dead-end leaf.
@@ -200,8 +464,8 @@ class MCTS:
                 action_from_parent=action,
                 player_to_move=node.player_to_move,
             )
-            child.untried_actions = []
-            child.untried_priors = []
+            child.untried_actions = ()
+            child.untried_priors = ()
             self._add_child(node, action, prior, child)
             return child, None
         child = Node(
@@ -210,60 +474,97 @@ class MCTS:
             player_to_move=self.adapter.current_player(state),
             state_key=self.adapter.state_key(state),
         )
-        if self.use_transposition and child.state_key in self.tt_stats:
-            s = self.tt_stats[child.state_key]
-            child.visits = int(s[0])
-            child.value_sum = float(s[1])
+        self._attach_tt_entry(child)
         child.untried_actions, child.untried_priors = self._ordered_actions(state, child.player_to_move)
         self._add_child(node, action, prior, child)
         return child, token
 
+    def _trim_transposition_tables(self) -> None:
+        """Evict the oldest entries (dicts keep insertion order) from oversized tables."""
+        for table in (self.tt_stats, self.tt_legal, self.tt_ordered):
+            excess = len(table) - self.tt_max_entries
+            if excess > 0:
+                for key in list(itertools.islice(table, excess)):
+                    del table[key]
+
+    def _attach_tt_entry(self, node: Node) -> None:
+        """Bind node to its transposition entry and seed its stats from it (one dict lookup)."""
+        if not self.use_transposition or node.state_key is None:
+            return
+        s = self.tt_stats.setdefault(node.state_key, [0.0, 0.0])
+        node.tt_entry = s
+        if s[0]:
+            node.visits = int(s[0])
+            node.value_sum = float(s[1])
+            node.log_visits = math.log(max(1, node.visits))
+
     def _add_child(self, node: Node, action: Action, prior: float, child: Node) -> None:
         idx = len(node.child_nodes)
-        node.action_to_child_idx[action] = idx
+        if idx == node.child_visits.size:
+            self._grow_child_arrays(node)
         node.child_actions.append(action)
         node.child_nodes.append(child)
-        node.child_priors.append(prior)
+        node.child_priors[idx] = prior
+        node.child_visits[idx] = child.visits
+        node.child_value_sum[idx] = child.value_sum
+        child.index_in_parent = idx
+
+    def _grow_child_arrays(self, node: Node) -> None:
+        n = len(node.child_nodes)
+        cap = max(4, 2 * n)
+        priors = np.zeros(cap, dtype=np.float32)
+        visits = np.zeros(cap, dtype=np.int32)
+        value_sum = np.zeros(cap, dtype=np.float64)
+        priors[:n] = node.child_priors[:n]
+        visits[:n] = node.child_visits[:n]
+        value_sum[:n] = node.child_value_sum[:n]
+        node.child_priors, node.child_visits, node.child_value_sum = priors, visits, value_sum
 
     def _remove_child_at(self, node: Node, idx: int) -> None:
-        action = node.child_actions[idx]
-        del node.action_to_child_idx[action]
+        node.child_nodes[idx].index_in_parent = -1
         last = len(node.child_nodes) - 1
         if idx != last:
             node.child_actions[idx] = node.child_actions[last]
             node.child_nodes[idx] = node.child_nodes[last]
+            node.child_nodes[idx].index_in_parent = idx
             node.child_priors[idx] = node.child_priors[last]
-            moved_action = node.child_actions[idx]
-            node.action_to_child_idx[moved_action] = idx
+            node.child_visits[idx] = node.child_visits[last]
+            node.child_value_sum[idx] = node.child_value_sum[last]
         node.child_actions.pop()
         node.child_nodes.pop()
-        node.child_priors.pop()
 
-    def _legal_actions_for_state(self, state: Any) -> List[Action]:
+    def _legal_actions_for_state(self, state: Any, key: Any = None) -> Tuple[Action, ...]:
         if not self.use_transposition:
-            return self.adapter.legal_actions(state)
-        key = self.adapter.state_key(state)
+            return tuple(self.adapter.legal_actions(state))
+        if key is None:
+            key = self.adapter.state_key(state)
         cached = self.tt_legal.get(key)
-        if cached is not None:
-            return list(cached)
-        actions = self.adapter.legal_actions(state)
-        self.tt_legal[key] = tuple(actions)
-        return actions
+        if cached is None:
+            cached = self.tt_legal[key] = tuple(self.adapter.legal_actions(state))
+        return cached
 
-    def _ordered_actions(self, state: Any, player: Player) -> Tuple[List[Action], List[float]]:
+    def _ordered_actions(self, state: Any, player: Player) -> Tuple[Tuple[Action, ...], Tuple[float, ...]]:
+        """Candidate actions best-first with their priors; the tuples are shared, never mutate them."""
+        key = None
         if self.use_transposition:
-            k = (self.adapter.state_key(state), player)
-            cached = self.tt_ordered.get(k)
+            key = self.adapter.state_key(state)
+            cached = self.tt_ordered.get((key, player))
             if cached is not None:
-                return list(cached[0]), list(cached[1])
-        actions = self._legal_actions_for_state(state)
+                return cached
+        ordered = self._score_and_order(state, player, self._legal_actions_for_state(state, key))
+        if key is not None:
+            self.tt_ordered[(key, player)] = ordered
+        return ordered
+
+    def _score_and_order(
+        self, state: Any, player: Player, actions: Tuple[Action, ...]
+    ) -> Tuple[Tuple[Action, ...], Tuple[float, ...]]:
         if not actions:
-            return [], []
-        if not hasattr(self.adapter, "action_prior"):
-            priors = [0.0] * len(actions)
-            return actions, priors
+            return (), ()
+        if not self._has_action_prior or self._neutral_scoring:
+            return actions, (0.0,) * len(actions)
         scored = []
-        tactical_available = hasattr(self.adapter, "tactical_priority")
+        tactical_available = self._has_tactical_priority
         for a in actions:
             prior = float(self.adapter.action_prior(state, a, player))
             if tactical_available:
@@ -272,49 +573,53 @@ class MCTS:
             else:
                 scored.append((0, prior, a))
         scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
-        ordered_actions = [x[2] for x in scored]
-        ordered_priors = [x[1] for x in scored]
-        if self.use_transposition:
-            self.tt_ordered[(self.adapter.state_key(state), player)] = (tuple(ordered_actions), tuple(ordered_priors))
-        return ordered_actions, ordered_priors
+        return tuple([x[2] for x in scored]), tuple([x[1] for x in scored])
 
     def _best_ucb_edge(self, node: Node) -> Tuple[int, Action, Node]:
         assert node.child_nodes, "UCB selection requires existing children."
-        log_n = math.log(max(1, node.visits))
-
-        def ucb(child: Node) -> float:
-            if child.visits == 0:
-                return float("inf")
-            exploit = child.value
-            explore = self.c_puct * math.sqrt(log_n / child.visits)
-            return exploit + explore
-
-        best_idx = max(range(len(node.child_nodes)), key=lambda i: ucb(node.child_nodes[i]))
+        n = len(node.child_nodes)
+        best_idx = _ucb_argmax(
+            node.child_visits[:n], node.child_value_sum[:n], node.log_visits, self.c_puct
+        )
         return best_idx, node.child_actions[best_idx], node.child_nodes[best_idx]
 
     def _simulate_from_clone(self, state: Any, rollout_player: Player) -> float:
-        sim_state = self.adapter.clone(state)
+        adapter = self.adapter
+        is_terminal = adapter.is_terminal
+        apply_action = adapter.apply_action
+        fused = self._has_rollout_scores
+        max_depth = self.rollout_depth
+        sim_state = adapter.clone(state)
         depth = 0
-        while depth < self.rollout_depth and not self.adapter.is_terminal(sim_state):
-            actions = self.adapter.legal_actions(sim_state)
-            if not actions:
-                break
-            action = self._sample_action(sim_state, actions, rollout_player)
-            sim_state = self.adapter.apply_action(sim_state, action)
+        while depth < max_depth and not is_terminal(sim_state):
+            if fused:
+                actions, priors, tactical = adapter.rollout_scores(sim_state, rollout_player)
+                if not actions:
+                    break
+                action = self._sample_scored_action(actions, priors, tactical)
+            else:
+                actions = adapter.legal_actions(sim_state)
+                if not actions:
+                    break
+                action = self._sample_action(sim_state, actions, rollout_player)
+            sim_state = apply_action(sim_state, action)
             depth += 1
 
-        if not self.adapter.is_terminal(sim_state):
-            if hasattr(self.adapter, "evaluate"):
-                return float(self.adapter.evaluate(sim_state, rollout_player))
+        if not is_terminal(sim_state):
+            if self._has_evaluate:
+                return float(adapter.evaluate(sim_state, rollout_player))
             return 0.0
-        return self.adapter.outcome_for_player(sim_state, rollout_player)
+        return adapter.outcome_for_player(sim_state, rollout_player)
 
     def _sample_action(self, state: Any, actions: List[Action], player: Player) -> Action:
-        if not hasattr(self.adapter, "action_prior"):
-            return self.rng.choice(actions)
-        priors = [float(self.adapter.action_prior(state, a, player)) for a in actions]
-        if hasattr(self.adapter, "tactical_priority"):
-            tactical = [int(self.adapter.tactical_priority(state, a, player)) for a in actions]
+        rng = self.rng
+        if not self._has_action_prior or self._neutral_scoring:
+            return rng.choice(actions)
+        action_prior = self.adapter.action_prior
+        priors = [float(action_prior(state, a, player)) for a in actions]
+        if self._has_tactical_priority:
+            tactical_priority = self.adapter.tactical_priority
+            tactical = [int(tactical_priority(state, a, player)) for a in actions]
             best_t = max(tactical) if tactical else 0
             if best_t >= 80:
                 idx = max(range(len(actions)), key=lambda i: (tactical[i], priors[i]))
@@ -322,41 +627,83 @@ class MCTS:
 
         # Fast greedy-biased policy over top-k actions.
         top_k = min(6, len(actions))
-        top_idx = sorted(range(len(actions)), key=lambda i: priors[i], reverse=True)[:top_k]
-        if self.rng.random() < self.rollout_greedy_prob:
+        top_idx = heapq.nlargest(top_k, range(len(actions)), key=priors.__getitem__)
+        if rng.random() < self.rollout_greedy_prob:
             return actions[top_idx[0]]
         # Weighted sample only among top-k to reduce noise and per-step overhead.
         top_actions = [actions[i] for i in top_idx]
         top_weights = [max(0.01, priors[i] + 1.0) for i in top_idx]
-        total = sum(top_weights)
-        r = self.rng.random() * total
-        acc = 0.0
-        for a, w in zip(top_actions, top_weights):
-            acc += w
-            if acc >= r:
-                return a
-        return top_actions[-1]
+        return rng.choices(top_actions, weights=top_weights)[0]
+
+    def _sample_scored_action(self, actions: List[Action], priors: np.ndarray, tactical: np.ndarray) -> Action:
+        """Array counterpart of _sample_action for adapters with a fused rollout_scores."""
+        if tactical.size:
+            best_t = tactical.max()
+            if best_t >= 80:
+                candidates = np.flatnonzero(tactical == best_t)
+                return actions[int(candidates[priors[candidates].argmax()])]
+
+        top_idx = np.argsort(-priors, kind="stable")[:6]
+        if self.rng.random() < self.rollout_greedy_prob:
+            return actions[int(top_idx[0])]
+        cum_weights = np.cumsum(np.maximum(0.01, priors[top_idx] + 1.0))
+        pick = int(np.searchsorted(cum_weights, self.rng.random() * cum_weights[-1]))
+        return actions[int(top_idx[min(pick, top_idx.size - 1)])]
 
     def _undo_tokens(self, state: Any, tokens: List[Any]) -> None:
+        undo_action = self.adapter.undo_action
         for token in reversed(tokens):
             if token is not None:
-                self.adapter.undo_action(state, token)
+                undo_action(state, token)
 
     def _backpropagate(self, node: Node, value: float) -> None:
+        # Refund the virtual loss charged to every edge of the path.
+        vloss = self.virtual_loss
+        dn = 1 - vloss
         cur = node
         cur_value = value
         while cur is not None:
             cur.visits += 1
             cur.value_sum += cur_value
-            if self.use_transposition and cur.state_key is not None:
-                s = self.tt_stats.get(cur.state_key)
-                if s is None:
-                    self.tt_stats[cur.state_key] = [1.0, cur_value]
-                else:
-                    s[0] += 1.0
-                    s[1] += cur_value
+            cur.log_visits = math.log(cur.visits)
+            parent = cur.parent
+            if parent is not None:
+                idx = cur.index_in_parent
+                parent.child_visits[idx] += dn
+                parent.child_value_sum[idx] += cur_value + vloss
+            s = cur.tt_entry
+            if s is not None:
+                s[0] += 1.0
+                s[1] += cur_value
             cur_value = -cur_value
-            cur = cur.parent
+            cur = parent
+
+
+# Per-process search instance of a root-parallel worker; its tables persist across moves.
+_worker_mcts: Optional[MCTS] = None
+
+
+def _init_root_parallel_worker(mcts: MCTS) -> None:
+    global _worker_mcts
+    _worker_mcts = mcts
+
+
+def _root_parallel_worker(
+    root_state: Any,
+    seed: int,
+    iterations: Optional[int],
+    max_time_s: Optional[float] = None,
+    min_iterations: int = 1,
+) -> Tuple[List[Tuple[Action, int]], int]:
+    mcts = _worker_mcts
+    mcts.rng = random.Random(seed)
+    # The deadline is taken in the worker so queueing time does not eat into the budget.
+    deadline = None if max_time_s is None else time.perf_counter() + max_time_s
+    root, iters_done = mcts._search(
+        root_state, max_iterations=iterations, deadline=deadline, min_iterations=min_iterations
+    )
+    n = len(root.child_nodes)
+    return list(zip(root.child_actions, root.child_visits[:n].tolist())), iters_done
 
 
 class SatellitesAdapter:
@@ -422,10 +769,8 @@ class SatellitesAdapter:
                 self.weights[k] = float(v)
 
     def clone(self, state: Any) -> Any:
-        if hasattr(state, "clone"):
-            return state.clone()
-        import copy
-        return copy.deepcopy(state)
+        # SatellitesGame.clone copies only the mutable game state; there is no deepcopy path.
+        return state.clone()
 
     def legal_actions(self, state: Any) -> List[Action]:
         return state.legal_actions()
@@ -456,20 +801,50 @@ class SatellitesAdapter:
         return 1.0 if winner == player else -1.0
 
     def _unit_cells(self, state: Any, owner: int, utype: str):
-        out = []
-        for (r, c), u in state.grid.items():
-            if u["owner"] == owner and u["type"] == utype:
-                out.append(((r, c), u["count"]))
-        return out
+        ensure_cache = getattr(state, "_ensure_cache", None)
+        if ensure_cache is None:
+            out = []
+            for (r, c), u in state.grid.items():
+                if u["owner"] == owner and u["type"] == utype:
+                    out.append(((r, c), u["count"]))
+            return out
+        # The engine keeps per-owner cell sets, so only occupied cells are visited.
+        ensure_cache()
+        cells = state.owner_tank_cells[owner] if utype == "tank" else state.owner_bot_cells[owner]
+        coords = state.cell_id_to_coord
+        counts = state.unit_count
+        return [(coords[cid], counts[cid]) for cid in cells]
 
     def _min_bot_dist(self, state: Any, owner: int, artefact):
-        bots = self._unit_cells(state, owner, "bot")
-        if not bots:
+        ensure_cache = getattr(state, "_ensure_cache", None)
+        if ensure_cache is None:
+            bots = self._unit_cells(state, owner, "bot")
+            if not bots:
+                return 99
+            return min(state.get_hex_distance(pos, artefact) for pos, _ in bots)
+        ensure_cache()
+        bot_cells = state.owner_bot_cells[owner]
+        if not bot_cells:
             return 99
-        return min(state.get_hex_distance(pos, artefact) for pos, _ in bots)
+        art_id = state.coord_to_cell_id.get(artefact)
+        if art_id is None:
+            return -1
+        dist = state.distance_by_cell_id
+        return min(dist[cid][art_id] for cid in bot_cells)
 
     def _is_adj_enemy_tank(self, state: Any, owner: int, pos):
         enemy = 1 - owner
+        ensure_cache = getattr(state, "_ensure_cache", None)
+        if ensure_cache is not None:
+            cid = state.coord_to_cell_id.get(pos)
+            if cid is None:
+                return False
+            ensure_cache()
+            tank_cells = state.owner_tank_cells[enemy]
+            if not tank_cells:
+                return False
+            to_id = state.coord_to_cell_id
+            return any(to_id[n] in tank_cells for n in state.neighbors_by_cell_id[cid])
         for nr, nc in state.get_hex_neighbors(pos[0], pos[1]):
             u = state.grid.get((nr, nc))
             if u and u["owner"] == enemy and u["type"] == "tank":
@@ -488,12 +863,18 @@ class SatellitesAdapter:
 
     def state_key(self, state: Any) -> Any:
         # Fast, order-independent checksum for occupied cells.
-        grid_checksum = 0
-        for (r, c), u in state.grid.items():
-            grid_checksum ^= hash((r, c, u["owner"], u["type"], u["count"]))
-
-        sats_key = tuple((sat["type"], sat["charges"]) for sat in state.satellites)
-        stamp = (
+        checksum = getattr(state, "grid_checksum", None)
+        if checksum is not None:
+            grid_checksum = checksum()
+        else:
+            grid_checksum = 0
+            for (r, c), u in state.grid.items():
+                grid_checksum ^= hash((r, c, u["owner"], u["type"], u["count"]))
+
+        sats_key = tuple([(sat["type"], sat["charges"]) for sat in state.satellites])
+        # The engine keeps artefacts in board order and only ever removes them, so the
+        # list order is already canonical; a differently ordered list only costs a miss.
+        return (
             state.turn,
             state.state,
             state.active_satellite_idx,
@@ -506,16 +887,10 @@ class SatellitesAdapter:
             state.move_amount_selection,
             getattr(state, "distribution_direction", None),
             tuple(state.scores),
-            tuple(sorted(state.artefacts)),
+            tuple(state.artefacts),
             sats_key,
             state.winner,
             state.turn_count,
             len(state.grid),
             grid_checksum,
         )
-        cache_stamp = getattr(state, "_mcts_key_stamp", None)
-        if cache_stamp == stamp:
-            return state._mcts_key_cache
-        state._mcts_key_stamp = stamp
-        state._mcts_key_cache = stamp
-        return stamp
@@ -11,7 +11,20 @@ from agents.mcts import MCTS, SatellitesAdapter
 from engine import SatellitesGame
 
 
-def run_benchmark(decisions: int, iterations: int, rollout_depth: int, seed: int):
+def warm_up(decisions: int, rollout_depth: int, seed: int) -> None:
+    """Untimed searches so board tables and the interpreter's specialised bytecode are warm."""
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), iterations=8, rollout_depth=rollout_depth, seed=seed)
+    for _ in range(decisions):
+        if game.state == "GAME_OVER":
+            break
+        action, _ = mcts.select_action(game)
+        game.apply_action(action)
+
+
+def run_benchmark(decisions: int, iterations: int, rollout_depth: int, seed: int, warmup: int = 2):
+    if warmup > 0:
+        warm_up(warmup, rollout_depth, seed + 1)
     adapter = SatellitesAdapter()
     game = SatellitesGame(headless=True)
     mcts = MCTS(adapter, iterations=iterations, rollout_depth=rollout_depth, seed=seed)
@@ -43,8 +56,9 @@ def main():
     parser.add_argument("--iterations", type=int, default=100)
     parser.add_argument("--rollout-depth", type=int, default=20)
     parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed warm-up decisions (0 to disable).")
     args = parser.parse_args()
-    run_benchmark(args.decisions, args.iterations, args.rollout_depth, args.seed)
+    run_benchmark(args.decisions, args.iterations, args.rollout_depth, args.seed, args.warmup)
 
 
 if __name__ == "__main__":
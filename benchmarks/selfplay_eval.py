@@ -1,4 +1,7 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import multiprocessing
 import pathlib
 import sys
 
@@ -30,35 +33,49 @@ def play_game(
     return game.winner if game.winner is not None else -1
 
 
-def run_eval(games: int, think_s: float, seed: int):
+def _make_agents(seed: int):
     strong_adapter = SatellitesAdapter()
     base_adapter = SatellitesAdapter(weights={"move_bot_capture": 4.0, "move_bot_capture_stack_scale": 0.2})
 
     strong_a = MCTS(strong_adapter, iterations=120, rollout_depth=16, seed=seed)
     base_a = MCTS(base_adapter, iterations=120, rollout_depth=16, seed=seed + 1)
+    return strong_a, base_a
 
-    strong_wins = 0
-    base_wins = 0
-    draws = 0
-
-    for g in range(games):
-        # Alternate colors to reduce first-player bias.
-        if g % 2 == 0:
-            winner = play_game(strong_a, base_a, think_s=think_s)
-            if winner == 0:
-                strong_wins += 1
-            elif winner == 1:
-                base_wins += 1
-            else:
-                draws += 1
-        else:
-            winner = play_game(base_a, strong_a, think_s=think_s)
-            if winner == 0:
-                base_wins += 1
-            elif winner == 1:
-                strong_wins += 1
-            else:
-                draws += 1
+
+def _strong_result(g: int, strong_a: MCTS, base_a: MCTS, think_s: float) -> int:
+    """Play game g and return +1/-1/0 for a strong win/base win/draw."""
+    # Alternate colors to reduce first-player bias.
+    if g % 2 == 0:
+        winner = play_game(strong_a, base_a, think_s=think_s)
+        strong_seat = 0
+    else:
+        winner = play_game(base_a, strong_a, think_s=think_s)
+        strong_seat = 1
+    if winner == strong_seat:
+        return 1
+    if winner == 1 - strong_seat:
+        return -1
+    return 0
+
+
+def _play_isolated_game(g: int, think_s: float, seed: int) -> int:
+    # Fresh agents per game so results do not depend on which worker ran which games.
+    strong_a, base_a = _make_agents(seed + 2 * g)
+    return _strong_result(g, strong_a, base_a, think_s)
+
+
+def run_eval(games: int, think_s: float, seed: int, workers: int = 1):
+    if workers > 1:
+        # Games are independent, so they run side by side in forked processes.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            results = list(pool.map(_play_isolated_game, range(games), repeat(think_s), repeat(seed)))
+    else:
+        strong_a, base_a = _make_agents(seed)
+        results = [_strong_result(g, strong_a, base_a, think_s) for g in range(games)]
+
+    strong_wins = results.count(1)
+    base_wins = results.count(-1)
+    draws = results.count(0)
 
     print(f"games={games}")
     print(f"think_s={think_s:.3f}")
@@ -74,8 +91,9 @@ def main():
     p.add_argument("--games", type=int, default=6)
     p.add_argument("--think-s", type=float, default=0.25)
     p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--workers", type=int, default=1, help="Play games in this many processes.")
     args = p.parse_args()
-    run_eval(args.games, args.think_s, args.seed)
+    run_eval(args.games, args.think_s, args.seed, args.workers)
 
 
 if __name__ == "__main__":
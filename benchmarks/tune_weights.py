@@ -1,8 +1,12 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import math
+import multiprocessing
 import pathlib
 import random
 import sys
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -25,9 +29,25 @@ TUNABLE_KEYS = [
     "eval_safe_bot_near_artefact",
 ]
 
+# SPRT hypotheses and error rates: (elo0, elo1, alpha, beta).
+DEFAULT_SPRT = (-5.0, 5.0, 0.05, 0.05)
+
+
+# One game object per process, reset between games rather than rebuilt.
+_process_game = None
+
+
+def _fresh_game() -> SatellitesGame:
+    global _process_game
+    if _process_game is None:
+        _process_game = SatellitesGame(headless=True)
+    else:
+        _process_game.reset()
+    return _process_game
+
 
 def play_game(p0: MCTS, p1: MCTS, think_s: float) -> int:
-    game = SatellitesGame(headless=True)
+    game = _fresh_game()
     while game.state != "GAME_OVER":
         agent = p0 if game.turn == 0 else p1
         action, _ = agent.select_action_for_time(game, think_s, min_iterations=6)
@@ -40,40 +60,109 @@ def play_game(p0: MCTS, p1: MCTS, think_s: float) -> int:
     return game.winner if game.winner is not None else -1
 
 
+def _challenger_result(g: int, c_mcts: MCTS, b_mcts: MCTS, think_s: float) -> int:
+    """Play game g and return +1/-1/0 for a challenger win/baseline win/draw."""
+    if g % 2 == 0:
+        winner = play_game(c_mcts, b_mcts, think_s)
+        c_seat = 0
+    else:
+        winner = play_game(b_mcts, c_mcts, think_s)
+        c_seat = 1
+    if winner == c_seat:
+        return 1
+    if winner == 1 - c_seat:
+        return -1
+    return 0
+
+
+def _play_isolated_game(
+    g: int,
+    challenger_weights: Dict[str, float],
+    baseline_weights: Dict[str, float],
+    think_s: float,
+    seeds: Tuple[int, int],
+) -> int:
+    c_mcts = MCTS(SatellitesAdapter(weights=challenger_weights), iterations=100, rollout_depth=14, seed=seeds[0])
+    b_mcts = MCTS(SatellitesAdapter(weights=baseline_weights), iterations=100, rollout_depth=14, seed=seeds[1])
+    return _challenger_result(g, c_mcts, b_mcts, think_s)
+
+
+def _elo_to_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def sprt_llr(wins: int, losses: int, draws: int, elo0: float, elo1: float) -> float:
+    """Log-likelihood ratio of elo1 vs elo0 for the challenger (normal approximation)."""
+    n = wins + losses + draws
+    if n == 0:
+        return 0.0
+    score = (wins + 0.5 * draws) / n
+    var = (wins * (1.0 - score) ** 2 + losses * score ** 2 + draws * (0.5 - score) ** 2) / n
+    if var <= 0.0:
+        return 0.0
+    s0 = _elo_to_score(elo0)
+    s1 = _elo_to_score(elo1)
+    return (s1 - s0) * (2.0 * score - s0 - s1) / (2.0 * var / n)
+
+
+def sprt_verdict(wins: int, losses: int, draws: int, sprt: Tuple[float, float, float, float]) -> Optional[bool]:
+    """True once elo1 is accepted, False once elo0 is accepted, None while undecided."""
+    elo0, elo1, alpha, beta = sprt
+    llr = sprt_llr(wins, losses, draws, elo0, elo1)
+    if llr >= math.log((1.0 - beta) / alpha):
+        return True
+    if llr <= math.log(beta / (1.0 - alpha)):
+        return False
+    return None
+
+
 def head_to_head(
     challenger_weights: Dict[str, float],
     baseline_weights: Dict[str, float],
     games: int,
     think_s: float,
     seed: int,
+    workers: int = 1,
+    sprt: Optional[Tuple[float, float, float, float]] = None,
 ) -> Tuple[int, int, int]:
+    """Play up to `games` games; with `sprt`, stop as soon as the test is decided."""
     rng = random.Random(seed)
-    c_adapter = SatellitesAdapter(weights=challenger_weights)
-    b_adapter = SatellitesAdapter(weights=baseline_weights)
-    c_mcts = MCTS(c_adapter, iterations=100, rollout_depth=14, seed=rng.randrange(10**9))
-    b_mcts = MCTS(b_adapter, iterations=100, rollout_depth=14, seed=rng.randrange(10**9))
-
-    c_wins = 0
-    b_wins = 0
-    draws = 0
-    for g in range(games):
-        if g % 2 == 0:
-            winner = play_game(c_mcts, b_mcts, think_s)
-            if winner == 0:
-                c_wins += 1
-            elif winner == 1:
-                b_wins += 1
-            else:
-                draws += 1
-        else:
-            winner = play_game(b_mcts, c_mcts, think_s)
-            if winner == 0:
-                b_wins += 1
-            elif winner == 1:
-                c_wins += 1
-            else:
-                draws += 1
-    return c_wins, b_wins, draws
+    tally = {1: 0, -1: 0, 0: 0}
+
+    def record(result: int) -> bool:
+        tally[result] += 1
+        return sprt is not None and sprt_verdict(tally[1], tally[-1], tally[0], sprt) is not None
+
+    if workers > 1:
+        # Independent games on separate processes; per-game seeds are drawn up front
+        # so the outcome does not depend on how games land on workers.
+        seeds = [(rng.randrange(10**9), rng.randrange(10**9)) for _ in range(games)]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, games) or 1,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as pool:
+            results = pool.map(
+                _play_isolated_game,
+                range(games),
+                repeat(challenger_weights),
+                repeat(baseline_weights),
+                repeat(think_s),
+                seeds,
+            )
+            for result in results:
+                if record(result):
+                    # Results are consumed in game order, so the stopping point matches a serial run.
+                    pool.shutdown(cancel_futures=True)
+                    break
+    else:
+        c_adapter = SatellitesAdapter(weights=challenger_weights)
+        b_adapter = SatellitesAdapter(weights=baseline_weights)
+        c_mcts = MCTS(c_adapter, iterations=100, rollout_depth=14, seed=rng.randrange(10**9))
+        b_mcts = MCTS(b_adapter, iterations=100, rollout_depth=14, seed=rng.randrange(10**9))
+        for g in range(games):
+            if record(_challenger_result(g, c_mcts, b_mcts, think_s)):
+                break
+    return tally[1], tally[-1], tally[0]
 
 
 def mutate(base: Dict[str, float], rng: random.Random, sigma_frac: float) -> Dict[str, float]:
@@ -86,7 +175,15 @@ def mutate(base: Dict[str, float], rng: random.Random, sigma_frac: float) -> Dic
     return out
 
 
-def tune(rounds: int, games: int, think_s: float, seed: int, sigma_frac: float):
+def tune(
+    rounds: int,
+    games: int,
+    think_s: float,
+    seed: int,
+    sigma_frac: float,
+    workers: int = 1,
+    sprt: Optional[Tuple[float, float, float, float]] = None,
+):
     rng = random.Random(seed)
     best = SatellitesAdapter().get_weights()
     best_score = 0.5
@@ -94,13 +191,17 @@ def tune(rounds: int, games: int, think_s: float, seed: int, sigma_frac: float):
 
     for r in range(1, rounds + 1):
         cand = mutate(best, rng, sigma_frac=sigma_frac)
-        c_wins, b_wins, draws = head_to_head(cand, best, games, think_s, rng.randrange(10**9))
-        score = (c_wins + 0.5 * draws) / games if games > 0 else 0.0
-        improved = score > best_score
+        c_wins, b_wins, draws = head_to_head(cand, best, games, think_s, rng.randrange(10**9), workers, sprt)
+        played = c_wins + b_wins + draws
+        score = (c_wins + 0.5 * draws) / played if played > 0 else 0.0
+        verdict = sprt_verdict(c_wins, b_wins, draws, sprt) if sprt is not None else None
+        # An undecided SPRT (game cap reached) falls back to the plain score comparison.
+        improved = verdict if verdict is not None else score > best_score
         print(
             f"round={r} score={score:.3f} "
             f"(c={c_wins}, b={b_wins}, d={draws}) "
             f"{'ACCEPT' if improved else 'REJECT'}"
+            f"{'' if verdict is None else ' (sprt)'}"
         )
         if improved:
             best = cand
@@ -119,8 +220,22 @@ def main():
     p.add_argument("--think-s", type=float, default=0.05)
     p.add_argument("--seed", type=int, default=1)
     p.add_argument("--sigma-frac", type=float, default=0.20)
+    p.add_argument("--workers", type=int, default=1, help="Play each round's games in this many processes.")
+    p.add_argument(
+        "--sprt",
+        action="store_true",
+        help="Stop each round early once an SPRT (elo0=-5, elo1=5, alpha=beta=0.05) is decided; --games is the cap.",
+    )
     args = p.parse_args()
-    tune(args.rounds, args.games, args.think_s, args.seed, args.sigma_frac)
+    tune(
+        args.rounds,
+        args.games,
+        args.think_s,
+        args.seed,
+        args.sigma_frac,
+        args.workers,
+        DEFAULT_SPRT if args.sprt else None,
+    )
 
 
 if __name__ == "__main__":
@@ -4,6 +4,31 @@ import random
 # PART 1: GAME LOGIC (Headless Engine)
 # ==========================================
 
+# Zobrist keys per (cell, owner, kind, count); counts past the table are folded in with hash().
+_ZOBRIST_COUNTS = 64
+_zobrist_tables = {}
+# Static board tables keyed by row widths; shared read-only by every game.
+_board_tables = {}
+# Start hexes per player; a player's opponent starts are _START_CELLS[1 - turn].
+_START_CELLS = (frozenset({(0, 3), (0, 4)}), frozenset({(8, 3), (8, 4)}))
+
+
+def _zobrist_table(num_cells):
+    table = _zobrist_tables.get(num_cells)
+    if table is None:
+        rng = random.Random(0x5A7E111E)
+        table = [rng.getrandbits(64) for _ in range(num_cells * 4 * _ZOBRIST_COUNTS)]
+        _zobrist_tables[num_cells] = table
+    return table
+
+
+def _zobrist_key(table, cid, owner, kind, count):
+    base = ((cid * 2 + owner) * 2 + kind - 1) * _ZOBRIST_COUNTS
+    if count < _ZOBRIST_COUNTS:
+        return table[base + count]
+    return table[base] ^ (hash(count) & 0xFFFFFFFFFFFFFFFF)
+
+
 class SatellitesGame:
     def __init__(self, headless=False):
         self.headless = headless
@@ -11,16 +36,47 @@ class SatellitesGame:
         # Board Setup
         # Rows 0-8. Widths: 8, 9, 10, 11, 12, 11, 10, 9, 8
         self.row_widths = [8, 9, 10, 11, 12, 11, 10, 9, 8]
-        (
-            self.cell_id_to_coord,
-            self.coord_to_cell_id,
-            self.neighbors_by_cell_id,
-        ) = self._build_topology()
-        self.num_cells = len(self.cell_id_to_coord)
-        self.distance_by_cell_id = self._build_distance_matrix()
+        # Topology and distances depend only on the board shape; build them once per process.
+        tables = _board_tables.get(tuple(self.row_widths))
+        if tables is None:
+            (
+                self.cell_id_to_coord,
+                self.coord_to_cell_id,
+                self.neighbors_by_cell_id,
+            ) = self._build_topology()
+            self.num_cells = len(self.cell_id_to_coord)
+            self.distance_by_cell_id = self._build_distance_matrix()
+            _board_tables[tuple(self.row_widths)] = (
+                self.cell_id_to_coord,
+                self.coord_to_cell_id,
+                self.neighbors_by_cell_id,
+                self.distance_by_cell_id,
+            )
+        else:
+            (
+                self.cell_id_to_coord,
+                self.coord_to_cell_id,
+                self.neighbors_by_cell_id,
+                self.distance_by_cell_id,
+            ) = tables
+            self.num_cells = len(self.cell_id_to_coord)
+        self.is_p0_start_cell = [False] * self.num_cells
+        self.is_p1_start_cell = [False] * self.num_cells
+        for coord in _START_CELLS[0]:
+            self.is_p0_start_cell[self.coord_to_cell_id[coord]] = True
+        for coord in _START_CELLS[1]:
+            self.is_p1_start_cell[self.coord_to_cell_id[coord]] = True
+        self.reset()
+
+    def reset(self, seed=None):
+        """Restore the opening position in place, keeping the board tables.
+
+        A seed shuffles the satellites with its own RNG, so the order is reproducible.
+        """
         self._grid = {}
         self.grid = {} # Key: (row, col), Value: {'owner': 0/1, 'type': 'tank'/'bot', 'count': int}
         self._cache_dirty = True
+        self._grid_checksum = None
         self.unit_owner = [-1] * self.num_cells
         self.unit_kind = [0] * self.num_cells  # 0 empty, 1 bot, 2 tank
         self.unit_count = [0] * self.num_cells
@@ -28,17 +84,13 @@ class SatellitesGame:
         self.owner_bot_cells = [set(), set()]
         self.owner_tank_cells = [set(), set()]
         self.is_artefact_cell = [False] * self.num_cells
-        self.is_p0_start_cell = [False] * self.num_cells
-        self.is_p1_start_cell = [False] * self.num_cells
+        if hasattr(self, 'distribution_direction'):
+            del self.distribution_direction
         
         # Artefacts
         self.artefacts = [(2,1), (2,8), (4,4), (4,7), (6,1), (6,8)]
         for coord in self.artefacts:
             self.is_artefact_cell[self.coord_to_cell_id[coord]] = True
-        for coord in ((0,3), (0,4)):
-            self.is_p0_start_cell[self.coord_to_cell_id[coord]] = True
-        for coord in ((8,3), (8,4)):
-            self.is_p1_start_cell[self.coord_to_cell_id[coord]] = True
         
         # Players: 0 (Red), 1 (Blue)
         # Starting units
@@ -58,7 +110,10 @@ class SatellitesGame:
             {'type': 'add_tank',  'charges': 0, 'name': 'Add Tank'},
             {'type': 'add_bot',   'charges': 0, 'name': 'Add Bot'},
         ]
-        random.shuffle(self.satellites)
+        if seed is None:
+            random.shuffle(self.satellites)
+        else:
+            random.Random(seed).shuffle(self.satellites)
         
         self.scores = [0, 0]
         self.turn = 0 # Player 0 starts
@@ -105,6 +160,7 @@ class SatellitesGame:
         self.owner_total_units = [0, 0]
         self.owner_bot_cells = [set(), set()]
         self.owner_tank_cells = [set(), set()]
+        self._grid_checksum = None
         for (r, c), u in self.grid.items():
             cid = self.coord_to_cell_id[(r, c)]
             owner = u['owner']
@@ -120,11 +176,68 @@ class SatellitesGame:
                 self.owner_bot_cells[owner].add(cid)
         self._cache_dirty = False
 
+    def _sync_cell_cache(self, coord):
+        """Re-read one cell into the unit cache and XOR its change into the checksum."""
+        cid = self.coord_to_cell_id[coord]
+        h = self._grid_checksum
+        table = _zobrist_table(self.num_cells) if h is not None else None
+        owner = self.unit_owner[cid]
+        if owner != -1:
+            kind = self.unit_kind[cid]
+            self.owner_total_units[owner] -= self.unit_count[cid]
+            cells = self.owner_tank_cells if kind == 2 else self.owner_bot_cells
+            cells[owner].discard(cid)
+            if table is not None:
+                h ^= _zobrist_key(table, cid, owner, kind, self.unit_count[cid])
+        u = self._grid.get(coord)
+        if u is None:
+            self.unit_owner[cid] = -1
+            self.unit_kind[cid] = 0
+            self.unit_count[cid] = 0
+        else:
+            owner = u['owner']
+            kind = 2 if u['type'] == 'tank' else 1
+            self.unit_owner[cid] = owner
+            self.unit_kind[cid] = kind
+            self.unit_count[cid] = u['count']
+            self.owner_total_units[owner] += u['count']
+            if kind == 2:
+                self.owner_tank_cells[owner].add(cid)
+            else:
+                self.owner_bot_cells[owner].add(cid)
+            if table is not None:
+                h ^= _zobrist_key(table, cid, owner, kind, u['count'])
+        self._grid_checksum = h
+
+    def _cell_changed(self, coord):
+        # A dirty cache is rebuilt wholesale on next use; a clean one is patched in place.
+        if not self._cache_dirty:
+            self._sync_cell_cache(coord)
+
+    def grid_checksum(self):
+        """Order-independent 64-bit Zobrist hash of the occupied cells.
+
+        Computed in full after a cache rebuild, then kept up to date incrementally as
+        execute_add/execute_move/undo_action touch individual cells.
+        """
+        self._ensure_cache()
+        if self._grid_checksum is None:
+            table = _zobrist_table(self.num_cells)
+            h = 0
+            for owner in (0, 1):
+                for kind, cells in ((1, self.owner_bot_cells[owner]), (2, self.owner_tank_cells[owner])):
+                    for cid in cells:
+                        h ^= _zobrist_key(table, cid, owner, kind, self.unit_count[cid])
+            self._grid_checksum = h
+        return self._grid_checksum
+
     def add_unit(self, r, c, owner, u_type, count):
-        if (r, c) not in self.grid:
-            self.grid[(r, c)] = {'owner': owner, 'type': u_type, 'count': 0}
-        self.grid[(r, c)]['count'] += count
-        self._cache_dirty = True
+        cell = self._grid.get((r, c))
+        if cell is None:
+            self._grid[(r, c)] = {'owner': owner, 'type': u_type, 'count': count}
+        else:
+            cell['count'] += count
+        self._cell_changed((r, c))
 
     def clone(self):
         """Fast, engine-aware clone used by search code."""
@@ -138,19 +251,21 @@ class SatellitesGame:
         new.neighbors_by_cell_id = self.neighbors_by_cell_id
         new.num_cells = self.num_cells
         new.distance_by_cell_id = self.distance_by_cell_id
+        new.is_p0_start_cell = self.is_p0_start_cell
+        new.is_p1_start_cell = self.is_p1_start_cell
 
         # Mutable game state.
         new._grid = {k: v.copy() for k, v in self._grid.items()}
         new._cache_dirty = self._cache_dirty
+        new._grid_checksum = self._grid_checksum
         new.unit_owner = self.unit_owner.copy()
         new.unit_kind = self.unit_kind.copy()
         new.unit_count = self.unit_count.copy()
         new.owner_total_units = self.owner_total_units.copy()
         new.owner_bot_cells = [self.owner_bot_cells[0].copy(), self.owner_bot_cells[1].copy()]
         new.owner_tank_cells = [self.owner_tank_cells[0].copy(), self.owner_tank_cells[1].copy()]
-        new.is_artefact_cell = self.is_artefact_cell.copy()
-        new.is_p0_start_cell = self.is_p0_start_cell.copy()
-        new.is_p1_start_cell = self.is_p1_start_cell.copy()
+        # Never written in place (captures swap in a new list), so clones can share it.
+        new.is_artefact_cell = self.is_artefact_cell
 
         new.artefacts = self.artefacts.copy()
         new.satellites = [sat.copy() for sat in self.satellites]
@@ -175,70 +290,87 @@ class SatellitesGame:
 
     def _capture_undo_token_for_action(self, action):
         kind = action[0]
-        changed_cells = {}
         if kind == 'add':
-            coords = [(action[1], action[2])]
+            coords = ((action[1], action[2]),)
         elif kind == 'move':
-            coords = [action[1], action[2]]
+            coords = (action[1], action[2])
         else:
-            coords = []
+            coords = ()
 
+        changed_cells = {}
         for coord in coords:
             if coord in changed_cells:
                 continue
             cell = self._grid.get(coord)
             changed_cells[coord] = None if cell is None else cell.copy()
 
-        return {
-            "_grid_cells": changed_cells,
-            "artefacts": self.artefacts.copy(),
-            "is_artefact_cell": self.is_artefact_cell.copy(),
-            "satellites": [sat.copy() for sat in self.satellites],
-            "scores": self.scores.copy(),
-            "turn": self.turn,
-            "state": self.state,
-            "active_satellite_idx": self.active_satellite_idx,
-            "actions_remaining": self.actions_remaining,
-            "picked_up_charges": self.picked_up_charges,
-            "action_type": self.action_type,
-            "selected_hex": self.selected_hex,
-            "pending_move_dest": self.pending_move_dest,
-            "pending_move_max": self.pending_move_max,
-            "move_amount_selection": self.move_amount_selection,
-            "info_message": self.info_message,
-            "winner": self.winner,
-            "turn_count": self.turn_count,
-            "MAX_TURNS": self.MAX_TURNS,
-            "distribution_direction": getattr(self, "distribution_direction", None),
-        }
+        # Only moves capture artefacts and score; only satellite/direction choices
+        # touch charges. Fields an action cannot change are left out of its token.
+        if kind == 'move':
+            # Captures replace both artefact lists instead of editing them, so references suffice.
+            extra = (self.artefacts, self.is_artefact_cell, self.scores.copy())
+        elif kind != 'add':
+            # Satellite choices and distribution only ever change charges.
+            extra = tuple([sat['charges'] for sat in self.satellites])
+        else:
+            extra = None
+        # A flat tuple, unpacked positionally by undo_action.
+        return (
+            kind,
+            changed_cells,
+            extra,
+            self.turn,
+            self.state,
+            self.active_satellite_idx,
+            self.actions_remaining,
+            self.picked_up_charges,
+            self.action_type,
+            self.selected_hex,
+            self.pending_move_dest,
+            self.pending_move_max,
+            self.move_amount_selection,
+            self.info_message,
+            self.winner,
+            self.turn_count,
+            self.MAX_TURNS,
+            getattr(self, "distribution_direction", None),
+        )
 
     def undo_action(self, token):
-        for coord, cell in token["_grid_cells"].items():
+        (
+            kind,
+            changed_cells,
+            extra,
+            self.turn,
+            self.state,
+            self.active_satellite_idx,
+            self.actions_remaining,
+            self.picked_up_charges,
+            self.action_type,
+            self.selected_hex,
+            self.pending_move_dest,
+            self.pending_move_max,
+            self.move_amount_selection,
+            self.info_message,
+            self.winner,
+            self.turn_count,
+            self.MAX_TURNS,
+            distribution_direction,
+        ) = token
+        for coord, cell in changed_cells.items():
             if cell is None:
                 self._grid.pop(coord, None)
             else:
                 self._grid[coord] = cell
-        self.artefacts = token["artefacts"]
-        self.is_artefact_cell = token["is_artefact_cell"]
-        self.satellites = token["satellites"]
-        self._cache_dirty = True
-        self.scores = token["scores"]
-        self.turn = token["turn"]
-        self.state = token["state"]
-        self.active_satellite_idx = token["active_satellite_idx"]
-        self.actions_remaining = token["actions_remaining"]
-        self.picked_up_charges = token["picked_up_charges"]
-        self.action_type = token["action_type"]
-        self.selected_hex = token["selected_hex"]
-        self.pending_move_dest = token["pending_move_dest"]
-        self.pending_move_max = token["pending_move_max"]
-        self.move_amount_selection = token["move_amount_selection"]
-        self.info_message = token["info_message"]
-        self.winner = token["winner"]
-        self.turn_count = token["turn_count"]
-        self.MAX_TURNS = token["MAX_TURNS"]
-        if token["distribution_direction"] is not None:
-            self.distribution_direction = token["distribution_direction"]
+        for coord in changed_cells:
+            self._cell_changed(coord)
+        if kind == 'move':
+            self.artefacts, self.is_artefact_cell, self.scores = extra
+        elif kind != 'add':
+            for sat, charges in zip(self.satellites, extra):
+                sat['charges'] = charges
+        if distribution_direction is not None:
+            self.distribution_direction = distribution_direction
         elif hasattr(self, "distribution_direction"):
             delattr(self, "distribution_direction")
 
@@ -307,7 +439,6 @@ class SatellitesGame:
             return False
         occ_owner = self.unit_owner[cid]
         occ_kind = self.unit_kind[cid]
-        current = self.grid.get((r, c))
 
         if unit_type == 'tank':
             is_own_tank_stack = (
@@ -316,17 +447,17 @@ class SatellitesGame:
             )
             if occ_owner != -1 and not is_own_tank_stack:
                 return False
-            opp_starts = [(8,3), (8,4)] if self.turn == 0 else [(0,3), (0,4)]
-            if (r, c) in opp_starts:
+            opp_start = self.is_p1_start_cell if self.turn == 0 else self.is_p0_start_cell
+            if opp_start[cid]:
                 return False
-            if (r, c) in self.artefacts:
+            if self.is_artefact_cell[cid]:
                 return False
             return True
 
-        is_own_stack = (current and current['owner'] == self.turn and current['type'] == unit_type)
-        valid_starts = [(0,3), (0,4)] if self.turn == 0 else [(8,3), (8,4)]
-        is_start_zone = ((r, c) in valid_starts) and (not current or is_own_stack)
-        return bool(is_own_stack or is_start_zone)
+        if occ_owner == self.turn and occ_kind == 1:
+            return True
+        own_start = self.is_p0_start_cell if self.turn == 0 else self.is_p1_start_cell
+        return own_start[cid] and occ_owner == -1
 
     def _is_legal_move(self, start, end, amount):
         if self.state != "PERFORM_ACTIONS" or "move" not in (self.action_type or ""):
@@ -346,15 +477,15 @@ class SatellitesGame:
         if src_kind != req_type:
             return False
 
-        if end not in self.get_hex_neighbors(start[0], start[1]):
+        if end not in self.neighbors_by_cell_id[sid]:
             return False
 
-        opp_starts = [(8,3), (8,4)] if self.turn == 0 else [(0,3), (0,4)]
-        if end in opp_starts:
+        opp_start = self.is_p1_start_cell if self.turn == 0 else self.is_p0_start_cell
+        if opp_start[eid]:
             return False
 
         move_type = src_kind
-        if move_type == 'tank' and end in self.artefacts:
+        if move_type == 'tank' and self.is_artefact_cell[eid]:
             return False
 
         if self.unit_owner[eid] == -1:
@@ -387,25 +518,67 @@ class SatellitesGame:
 
         actions = []
         if "add" in (self.action_type or ""):
-            for r in range(9):
-                for c in range(self.row_widths[r]):
-                    if self._is_legal_add(r, c):
-                        actions.append(('add', r, c))
+            # Same rules as _is_legal_add, read straight off the per-cell unit arrays.
+            self._ensure_cache()
+            turn = self.turn
+            if self.owner_total_units[turn] >= 20:
+                return actions
+            coords = self.cell_id_to_coord
+            owner = self.unit_owner
+            if 'tank' in self.action_type:
+                kind = self.unit_kind
+                is_artefact = self.is_artefact_cell
+                opp_start = self.is_p1_start_cell if turn == 0 else self.is_p0_start_cell
+                for cid in range(self.num_cells):
+                    o = owner[cid]
+                    if o != -1 and (o != turn or kind[cid] != 2):
+                        continue
+                    if opp_start[cid] or is_artefact[cid]:
+                        continue
+                    actions.append(('add',) + coords[cid])
+            else:
+                own_start = self.is_p0_start_cell if turn == 0 else self.is_p1_start_cell
+                bot_cells = self.owner_bot_cells[turn]
+                for cid in range(self.num_cells):
+                    if cid in bot_cells or (own_start[cid] and owner[cid] == -1):
+                        actions.append(('add',) + coords[cid])
             return actions
 
         if "move" in (self.action_type or ""):
+            # Same rules as _is_legal_move, resolved once per destination rather than per amount.
             self._ensure_cache()
-            req_type = 'tank' if 'tank' in self.action_type else 'bot'
-            source_cells = self.owner_tank_cells[self.turn] if req_type == 'tank' else self.owner_bot_cells[self.turn]
-            for cid in source_cells:
-                r, c = self.cell_id_to_coord[cid]
-                unit = self.grid.get((r, c))
-                if not unit:
-                    continue
-                for nr, nc in self.get_hex_neighbors(r, c):
-                    for amount in range(1, unit['count'] + 1):
-                        if self._is_legal_move((r, c), (nr, nc), amount):
-                            actions.append(('move', (r, c), (nr, nc), amount))
+            turn = self.turn
+            kind_req = 2 if 'tank' in self.action_type else 1
+            source_cells = self.owner_tank_cells[turn] if kind_req == 2 else self.owner_bot_cells[turn]
+            coords = self.cell_id_to_coord
+            to_id = self.coord_to_cell_id
+            owner = self.unit_owner
+            kind = self.unit_kind
+            count = self.unit_count
+            is_artefact = self.is_artefact_cell
+            opp_start = self.is_p1_start_cell if turn == 0 else self.is_p0_start_cell
+            for sid in source_cells:
+                start = coords[sid]
+                top = count[sid] + 1
+                for end in self.neighbors_by_cell_id[sid]:
+                    eid = to_id[end]
+                    if opp_start[eid]:
+                        continue
+                    if kind_req == 2 and is_artefact[eid]:
+                        continue
+                    lowest = 1
+                    o = owner[eid]
+                    if o == turn:
+                        if kind[eid] != kind_req:
+                            continue
+                    elif o != -1:
+                        # Bots cannot attack; tanks only attack smaller tank stacks.
+                        if kind_req == 1:
+                            continue
+                        if kind[eid] == 2:
+                            lowest = count[eid] + 1
+                    for amount in range(lowest, top):
+                        actions.append(('move', start, end, amount))
             return actions
 
         return actions
@@ -454,22 +627,22 @@ class SatellitesGame:
         return tuple(cell_id_to_coord), coord_to_cell_id, tuple(neighbors_by_cell_id)
 
     def _build_distance_matrix(self):
-        distance = [[-1] * self.num_cells for _ in range(self.num_cells)]
+        # Resolve neighbour coords to ids once so the BFS below is pure list indexing.
+        to_id = self.coord_to_cell_id
+        neighbor_ids = [[to_id[coord] for coord in nbrs] for nbrs in self.neighbors_by_cell_id]
+        distance = []
         for src in range(self.num_cells):
+            row = [-1] * self.num_cells
+            row[src] = 0
             queue = [src]
-            distance[src][src] = 0
-            head = 0
-            while head < len(queue):
-                cur = queue[head]
-                head += 1
-                base_d = distance[src][cur]
-                for nr, nc in self.neighbors_by_cell_id[cur]:
-                    nxt = self.coord_to_cell_id[(nr, nc)]
-                    if distance[src][nxt] != -1:
-                        continue
-                    distance[src][nxt] = base_d + 1
-                    queue.append(nxt)
-        return tuple(tuple(row) for row in distance)
+            for cur in queue:
+                next_d = row[cur] + 1
+                for nxt in neighbor_ids[cur]:
+                    if row[nxt] == -1:
+                        row[nxt] = next_d
+                        queue.append(nxt)
+            distance.append(tuple(row))
+        return tuple(distance)
 
     def get_hex_neighbors(self, r, c):
         cell_id = self.coord_to_cell_id.get((r, c))
@@ -484,6 +657,28 @@ class SatellitesGame:
             return -1
         return self.distance_by_cell_id[a_id][b_id]
 
+    def _can_add(self, req_type):
+        """True if the current player has at least one placement for req_type ('tank'/'bot')."""
+        self._ensure_cache()
+        turn = self.turn
+        if self.owner_total_units[turn] >= 20:
+            return False
+        if req_type == 'tank':
+            # Tanks can drop on own tank stacks, or empty non-opponent-start hexes.
+            if self.owner_tank_cells[turn]:
+                return True
+            opp_start_mask = self.is_p1_start_cell if turn == 0 else self.is_p0_start_cell
+            owner = self.unit_owner
+            is_artefact = self.is_artefact_cell
+            for cid in range(self.num_cells):
+                if owner[cid] == -1 and not opp_start_mask[cid] and not is_artefact[cid]:
+                    return True
+            return False
+        # Bots: own stacks, or an empty own start hex.
+        if self.owner_bot_cells[turn]:
+            return True
+        return any(self.unit_owner[self.coord_to_cell_id[pos]] == -1 for pos in _START_CELLS[turn])
+
     def check_actions_still_possible(self):
         """Checks if any valid moves remain for the current action type. If not, auto-end turn."""
         if not self.action_type:
@@ -497,68 +692,46 @@ class SatellitesGame:
         
         # 1. ADD VALID?
         if "add" in self.action_type:
-            # Check Cap
-            if self.get_player_unit_count(self.turn) >= 20:
-                can_act = False
-            else:
-                # Check Placement Locations
-                if req_type == 'tank':
-                    # Tanks can drop on own tank stacks, or empty non-opponent-start hexes.
-                    opp_start_mask = self.is_p1_start_cell if self.turn == 0 else self.is_p0_start_cell
-
-                    # Scan grid for any valid empty spot
-                    for cid in range(self.num_cells):
-                        if self.unit_owner[cid] == -1 and not opp_start_mask[cid] and not self.is_artefact_cell[cid]:
-                            can_act = True
-                            break
-                    # Or any existing own tank stack
-                    if not can_act:
-                        can_act = len(self.owner_tank_cells[self.turn]) > 0
-                else:
-                    # OLD RULE (Bots): Start Zones or Own Stacks
-                    # 1. Existing Own Stacks?
-                    if req_type == 'bot':
-                        can_act = len(self.owner_bot_cells[self.turn]) > 0
-                    # 2. Empty Start Zones?
-                    if not can_act:
-                        starts = [(0,3), (0,4)] if self.turn == 0 else [(8,3), (8,4)]
-                        for pos in starts:
-                            if pos not in self.grid:
-                                can_act = True
-                                break
+            can_act = self._can_add(req_type)
         
         # 2. MOVE VALID?
         elif "move" in self.action_type:
             # Check if user has ANY units of this type that can move
-            opp_starts = [(8,3), (8,4)] if self.turn == 0 else [(0,3), (0,4)]
-            for pos, unit in self.grid.items():
-                if unit['owner'] == self.turn and unit['type'] == req_type:
-                    # Check neighbors for THIS unit
-                    neighbors = self.get_hex_neighbors(pos[0], pos[1])
-                    for nr, nc in neighbors:
-                        # NEW RULE: No entry to opponent starting hexes
-                        if (nr, nc) in opp_starts: continue
-
-                        target_cell = self.grid.get((nr,nc))
-                        
-                        # Apply same rules as in action_mask
-                        # 1. Tank -> Artefact = No
-                        if req_type == 'tank' and (nr, nc) in self.artefacts: continue
-                        
+            turn = self.turn
+            kind_req = 2 if req_type == 'tank' else 1
+            source_cells = self.owner_tank_cells[turn] if kind_req == 2 else self.owner_bot_cells[turn]
+            opp_start_mask = self.is_p1_start_cell if turn == 0 else self.is_p0_start_cell
+            owner = self.unit_owner
+            kind = self.unit_kind
+            count = self.unit_count
+            to_id = self.coord_to_cell_id
+            for sid in source_cells:
+                # Check neighbors for THIS unit
+                for coord in self.neighbors_by_cell_id[sid]:
+                    nid = to_id[coord]
+                    # NEW RULE: No entry to opponent starting hexes
+                    if opp_start_mask[nid]: continue
+
+                    # Apply same rules as in action_mask
+                    # 1. Tank -> Artefact = No
+                    if kind_req == 2 and self.is_artefact_cell[nid]: continue
+
+                    target_owner = owner[nid]
+                    if target_owner != -1:
                         # 2. Bot -> Enemy = No
-                        if req_type == 'bot' and target_cell and target_cell['owner'] != self.turn: continue
-                        
+                        if kind_req == 1 and target_owner != turn: continue
+
                         # 3. Diff Type Merge = No
-                        if target_cell and target_cell['owner'] == self.turn and target_cell['type'] != req_type: continue
-                        
+                        if target_owner == turn and kind[nid] != kind_req: continue
+
                         # 4. Tank Attack Size Rule
-                        if req_type == 'tank' and target_cell and target_cell['owner'] != self.turn:
-                            if target_cell['type'] == 'tank' and target_cell['count'] >= unit['count']:
+                        if kind_req == 2 and target_owner != turn:
+                            if kind[nid] == 2 and count[nid] >= count[sid]:
                                 continue
-                        
-                        # If we reach here, at least one move is possible
-                        can_act = True
-                        break
+
+                    # If we reach here, at least one move is possible
+                    can_act = True
+                    break
                 if can_act: break
         
         if not can_act:
@@ -596,7 +769,7 @@ class SatellitesGame:
                 return False
 
             # 2. Must not be opponent start zone
-            opp_starts = [(8,3), (8,4)] if self.turn == 0 else [(0,3), (0,4)]
+            opp_starts = _START_CELLS[1 - self.turn]
             if (r,c) in opp_starts:
                 self.info_message = "Cannot place in opponent start zone."
                 return False
@@ -611,7 +784,7 @@ class SatellitesGame:
                 current['count'] += 1
             else:
                 self.grid[(r,c)] = {'owner': self.turn, 'type': 'tank', 'count': 1}
-            self._cache_dirty = True
+            self._cell_changed((r, c))
             self.actions_remaining -= 1
             self.info_message = f"Added tank. Actions: {self.actions_remaining}"
             
@@ -627,7 +800,7 @@ class SatellitesGame:
             is_own_stack = (current and current['owner'] == self.turn and current['type'] == unit_type)
             
             # 2. Starting Zones (if empty or own)
-            valid_starts = [(0,3), (0,4)] if self.turn == 0 else [(8,3), (8,4)]
+            valid_starts = _START_CELLS[self.turn]
             is_start_zone = ((r,c) in valid_starts) and (not current or is_own_stack)
 
             if not (is_own_stack or is_start_zone):
@@ -637,12 +810,12 @@ class SatellitesGame:
             # --- EXECUTION ---
             if current:
                 current['count'] += 1
-                self._cache_dirty = True
+                self._cell_changed((r, c))
                 self.actions_remaining -= 1
                 self.info_message = f"Added {unit_type}. Actions: {self.actions_remaining}"
             else:
                 self.grid[(r,c)] = {'owner': self.turn, 'type': unit_type, 'count': 1}
-                self._cache_dirty = True
+                self._cell_changed((r, c))
                 self.actions_remaining -= 1
                 self.info_message = f"Added {unit_type}. Actions: {self.actions_remaining}"
                 
@@ -729,12 +902,12 @@ class SatellitesGame:
         cell = self.grid[start]
         if cell['owner'] != self.turn: return False, 0, 0
         
-        neighbors = self.get_hex_neighbors(start[0], start[1])
-        if end not in neighbors:
+        start_id = self.coord_to_cell_id.get(start)
+        if start_id is None or end not in self.neighbors_by_cell_id[start_id]:
             self.info_message = "Invalid Move: Not adjacent"
             return False, 0, 0
 
-        opp_starts = [(8,3), (8,4)] if self.turn == 0 else [(0,3), (0,4)]
+        opp_starts = _START_CELLS[1 - self.turn]
         if end in opp_starts:
             self.info_message = "Cannot move onto opponent starting hex!"
             return False, 0, 0
@@ -744,65 +917,57 @@ class SatellitesGame:
             self.info_message = "Tanks cannot capture artefacts!"
             return False, 0, 0
 
-        # --- EXECUTION ---
-        cell['count'] -= amount
-        self._cache_dirty = True
-        if cell['count'] < 0: return False, 0, 0
-        
-        if cell['count'] == 0:
-            del self.grid[start]
-            
+        if cell['count'] < amount:
+            return False, 0, 0
+
         target = self.grid.get(end)
-        did_move_in = True 
-        
-        # Track our rewards
-        units_destroyed = 0 
-        score_gain = 0
-        
         if target:
             if target['owner'] == self.turn:
-                # Merge
-                if target['type'] == move_type:
-                    target['count'] += amount
-                else: 
-                     # Blocked
-                     self.info_message = "Blocked: Different unit type"
-                     if start not in self.grid: self.grid[start] = cell
-                     self.grid[start]['count'] += amount 
-                     return False, 0, 0
-            else:
-                # Combat / Attack
-                if move_type == 'bot':
-                    self.info_message = "Bots cannot attack!"
-                    if start not in self.grid: self.grid[start] = cell
-                    self.grid[start]['count'] += amount
+                if target['type'] != move_type:
+                    self.info_message = "Blocked: Different unit type"
                     return False, 0, 0
+            elif move_type == 'bot':
+                self.info_message = "Bots cannot attack!"
+                return False, 0, 0
+            elif target['type'] == 'tank' and target['count'] >= amount:
+                self.info_message = "Can only attack smaller tank stack!"
+                return False, 0, 0
 
-                if move_type == 'tank' and target['type'] == 'tank' and target['count'] >= amount:
-                     self.info_message = "Can only attack smaller tank stack!"
-                     if start not in self.grid: self.grid[start] = cell
-                     self.grid[start]['count'] += amount
-                     return False, 0, 0
+        # --- EXECUTION ---
+        # Everything is validated above, so each case below is a straight write.
+        did_move_in = True
 
-                # Successful Kill
-                units_destroyed = target['count'] 
-                del self.grid[end]
-                
-                if move_type == 'tank':
-                    did_move_in = False
-                    if start not in self.grid: self.grid[start] = cell
-                    self.grid[start]['count'] += amount
-                    self.info_message = "Attack Successful! Tank holds position."
-                else:
-                    self.grid[end] = {'owner': self.turn, 'type': move_type, 'count': amount}
+        # Track our rewards
+        units_destroyed = 0
+        score_gain = 0
+
+        if target and target['owner'] != self.turn:
+            # Successful Kill: the tank holds position, the source stack is untouched
+            units_destroyed = target['count']
+            del self.grid[end]
+            did_move_in = False
+            self.info_message = "Attack Successful! Tank holds position."
+            self._cell_changed(end)
         else:
-            # Move to empty
-            self.grid[end] = {'owner': self.turn, 'type': move_type, 'count': amount}
+            cell['count'] -= amount
+            if cell['count'] == 0:
+                del self.grid[start]
+            if target:
+                # Merge
+                target['count'] += amount
+            else:
+                # Move to empty
+                self.grid[end] = {'owner': self.turn, 'type': move_type, 'count': amount}
+            self._cell_changed(start)
+            self._cell_changed(end)
         
         # --- ARTEFACT LOGIC ---
         if did_move_in and end in self.artefacts:
-            self.artefacts.remove(end)
-            self.is_artefact_cell[self.coord_to_cell_id[end]] = False
+            # Copy-on-write: clones and undo tokens hold references to the old lists.
+            self.artefacts = [a for a in self.artefacts if a != end]
+            is_artefact = self.is_artefact_cell.copy()
+            is_artefact[self.coord_to_cell_id[end]] = False
+            self.is_artefact_cell = is_artefact
             # Rule: 1 point per bot in the stack
             score_gain = amount  
             self.scores[self.turn] += score_gain 
@@ -871,34 +1036,7 @@ class SatellitesGame:
         
         elif action_main == 'add':
             # Check if any valid placement exists
-            can_add = False
-            
-            # 1. Check Cap
-            if self.get_player_unit_count(self.turn) >= 20: 
-                can_add = False # At cap, no adds allowed
-            else:
-                if req_type == 'tank':
-                    # Tanks can drop on own tank stacks, or empty non-opponent-start hexes.
-                    opp_start_mask = self.is_p1_start_cell if self.turn == 0 else self.is_p0_start_cell
-                    for cid in range(self.num_cells):
-                        if self.unit_owner[cid] == -1 and not opp_start_mask[cid] and not self.is_artefact_cell[cid]:
-                            can_add = True
-                            break
-                    if not can_add:
-                        can_add = len(self.owner_tank_cells[self.turn]) > 0
-                else:
-                    # OLD RULE (Bots)
-                    # 2. Existing Own Stacks?
-                    if req_type == 'bot':
-                        can_add = len(self.owner_bot_cells[self.turn]) > 0
-                    
-                    # 3. Empty Start Zones?
-                    if not can_add:
-                        starts = [(0,3), (0,4)] if self.turn == 0 else [(8,3), (8,4)]
-                        for pos in starts:
-                            if pos not in self.grid: # Empty start zone
-                                can_add = True
-                                break
+            can_add = self._can_add(req_type)
             
             if not can_add:
                 can_act = False
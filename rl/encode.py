@@ -27,9 +27,14 @@ class FeatureEncoder:
         self.global_feature_size = 2 + 2 + 4 + 7 + 3 + 30
         self.feature_dim = self.num_cells * self.cell_feature_size + self.global_feature_size
 
-    def encode(self, game: SatellitesGame) -> np.ndarray:
+    def encode(self, game: SatellitesGame, out: np.ndarray | None = None) -> np.ndarray:
+        """Encode ``game``; when ``out`` is given it is overwritten and returned."""
         game._ensure_cache()
-        feat = np.zeros(self.feature_dim, dtype=np.float32)
+        if out is None:
+            feat = np.zeros(self.feature_dim, dtype=np.float32)
+        else:
+            feat = out
+            feat.fill(0.0)
         p = 0
 
         for cid in range(self.num_cells):
@@ -56,6 +56,8 @@ class Trainer:
         target_pi = torch.from_numpy(np.stack([b.policy for b in batch])).float().to(self.config.device)
         target_v = torch.from_numpy(np.array([b.value for b in batch], dtype=np.float32)).to(self.config.device)
 
+        # Self-play puts the shared model in eval mode.
+        self.model.train()
         logits, value = self.model(x)
         log_probs = F.log_softmax(logits, dim=1)
         policy_loss = -(target_pi * log_probs).sum(dim=1).mean()
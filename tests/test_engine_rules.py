@@ -1,3 +1,7 @@
+import random
+
+import pytest
+
 from engine import SatellitesGame
 from agents.mcts import MCTS, SatellitesAdapter
 
@@ -122,6 +126,45 @@ def test_cache_rebuilds_after_external_grid_assignment() -> None:
     assert game.get_player_unit_count(1) == 2
 
 
+def test_grid_checksum_tracks_grid_contents() -> None:
+    game = SatellitesGame(headless=True)
+    _prep_add_tank(game, turn=0)
+    k0 = game.grid_checksum()
+
+    success, token, _ = game.apply_action_with_undo(("add", 4, 5))
+    assert success is True
+    assert game.grid_checksum() != k0
+
+    game.undo_action(token)
+    assert game.grid_checksum() == k0
+
+    same = SatellitesGame(headless=True)
+    same.grid = {k: v.copy() for k, v in reversed(list(game.grid.items()))}
+    assert same.grid_checksum() == k0
+
+
+def test_grid_checksum_is_updated_incrementally_on_move() -> None:
+    game = SatellitesGame(headless=True)
+    game.grid = {
+        (4, 4): {"owner": 0, "type": "tank", "count": 2},
+        (4, 5): {"owner": 1, "type": "bot", "count": 1},
+    }
+    game.turn = 0
+    game.state = "PERFORM_ACTIONS"
+    game.action_type = "move_tank"
+    game.actions_remaining = 2
+    k0 = game.grid_checksum()
+
+    success, token, _ = game.apply_action_with_undo(("move", (4, 4), (4, 5), 2))
+    assert success is True
+    rebuilt = SatellitesGame(headless=True)
+    rebuilt.grid = {k: v.copy() for k, v in game.grid.items()}
+    assert game.grid_checksum() == rebuilt.grid_checksum()
+
+    game.undo_action(token)
+    assert game.grid_checksum() == k0
+
+
 def test_clone_is_independent() -> None:
     game = SatellitesGame(headless=True)
     cloned = game.clone()
@@ -137,6 +180,32 @@ def test_clone_is_independent() -> None:
     assert game.satellites[0]["charges"] != cloned.satellites[0]["charges"]
 
 
+def test_reset_restores_opening_position() -> None:
+    game = SatellitesGame(headless=True)
+    fresh = SatellitesGame(headless=True)
+    while game.state != "GAME_OVER" and game.turn_count < 4:
+        game.apply_action(game.legal_actions()[-1])
+
+    game.reset()
+
+    assert game.grid == fresh.grid
+    assert game.grid_checksum() == fresh.grid_checksum()
+    assert game.artefacts == fresh.artefacts
+    assert game.scores == fresh.scores
+    assert sorted(s["type"] for s in game.satellites) == sorted(s["type"] for s in fresh.satellites)
+    assert (game.turn, game.state, game.turn_count) == (0, "CHOOSE_SATELLITE", 1)
+    assert not hasattr(game, "distribution_direction")
+
+
+def test_reset_seed_fixes_satellite_order() -> None:
+    game = SatellitesGame(headless=True)
+    game.reset(seed=7)
+    first = [s["type"] for s in game.satellites]
+    game.reset(seed=7)
+
+    assert [s["type"] for s in game.satellites] == first
+
+
 def test_apply_add_with_undo_roundtrip() -> None:
     game = SatellitesGame(headless=True)
     _prep_add_tank(game, turn=0)
@@ -222,6 +291,132 @@ def test_mcts_smoke_selects_legal_action() -> None:
     assert action in game.legal_actions()
 
 
+def test_mcts_transposition_tables_evict_oldest_entries() -> None:
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), iterations=30, rollout_depth=6, seed=1, tt_max_entries=5)
+    mcts.select_action(game)
+    assert len(mcts.tt_stats) > 5
+    newest = list(mcts.tt_stats)[-5:]
+
+    mcts._trim_transposition_tables()
+
+    assert list(mcts.tt_stats) == newest
+    assert len(mcts.tt_legal) <= 5
+    assert len(mcts.tt_ordered) <= 5
+
+
+def test_mcts_tt_value_reuse_selects_legal_action() -> None:
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), iterations=40, rollout_depth=6, seed=1, tt_reuse_visits=1)
+    mcts.select_action(game)
+    action, _ = mcts.select_action(game)
+    assert action in game.legal_actions()
+
+
+def test_mcts_averages_multiple_rollouts_per_leaf() -> None:
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), iterations=12, rollout_depth=6, seed=1, rollouts_per_leaf=3)
+    action, stats = mcts.select_action(game)
+    assert action in game.legal_actions()
+    assert stats["iterations"] == 12
+
+
+def test_mcts_select_action_parallel_merges_worker_trees() -> None:
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), iterations=24, rollout_depth=6, seed=1)
+    try:
+        action, stats = mcts.select_action_parallel(game, n_workers=2)
+    finally:
+        mcts.close()
+
+    assert action in game.legal_actions()
+    assert stats["iterations"] == 24
+    # Root visits may also include transposition-seeded visits, never fewer than were searched.
+    assert stats["root_visits"] >= stats["iterations"]
+    assert 0 < stats["best_action_visits"] <= stats["root_visits"]
+
+
+def test_mcts_select_action_parallel_single_worker_is_serial() -> None:
+    game = SatellitesGame(headless=True)
+    parallel = MCTS(SatellitesAdapter(), iterations=16, rollout_depth=6, seed=3)
+    serial = MCTS(SatellitesAdapter(), iterations=16, rollout_depth=6, seed=3)
+
+    assert parallel.select_action_parallel(game, n_workers=1) == serial.select_action(game)
+    assert parallel._pool is None
+
+
+def test_mcts_select_action_parallel_for_time_stats() -> None:
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), rollout_depth=4, seed=2)
+    try:
+        action, first = mcts.select_action_parallel_for_time(game, 0.05, n_workers=2, min_iterations=5)
+        _, second = mcts.select_action_parallel_for_time(game, 0.05, n_workers=2, min_iterations=5)
+    finally:
+        mcts.close()
+
+    assert action in game.legal_actions()
+    for stats in (first, second):
+        # iterations: searched by all workers together, each doing at least min_iterations.
+        assert stats["iterations"] >= 2 * 5
+        assert stats["root_visits"] >= stats["iterations"]
+    # The warm workers' transposition tables seed visits from the first search.
+    assert second["root_visits"] > second["iterations"]
+
+
+def test_mcts_close_shuts_down_worker_pool() -> None:
+    game = SatellitesGame(headless=True)
+    mcts = MCTS(SatellitesAdapter(), iterations=8, rollout_depth=4, seed=1)
+    mcts.select_action_parallel(game, n_workers=2)
+    pool = mcts._pool
+    assert pool is not None
+
+    mcts.close()
+
+    assert mcts._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+    mcts.close()  # idempotent
+
+
+class _PinnedSatelliteAdapter(SatellitesAdapter):
+    """Offers a single satellite choice, picked by ``pick``, so the action a worker returns shows its adapter."""
+
+    def __init__(self, pick: int) -> None:
+        super().__init__()
+        self.pick = pick
+
+    def legal_actions(self, state):
+        actions = super().legal_actions(state)
+        if state.state == "CHOOSE_SATELLITE":
+            return [actions[self.pick % len(actions)]]
+        return actions
+
+
+def test_mcts_parallel_workers_see_changed_adapter_and_settings() -> None:
+    game = SatellitesGame(headless=True)
+    legal = game.legal_actions()
+    mcts = MCTS(_PinnedSatelliteAdapter(pick=0), iterations=16, rollout_depth=4, seed=1)
+    try:
+        action, _ = mcts.select_action_parallel(game, n_workers=2)
+        assert action == legal[0]
+
+        mcts.adapter.pick = 1
+        action, _ = mcts.select_action_parallel(game, n_workers=2)
+        assert action == legal[1]
+
+        mcts.adapter = SatellitesAdapter()
+        _, stats = mcts.select_action_parallel(game, n_workers=2)
+        assert stats["best_action_visits"] < stats["root_visits"]
+
+        # Widening that never admits a second root child leaves all visits on one action.
+        mcts.widening_base = 1
+        mcts.widening_every = 10**9
+        _, stats = mcts.select_action_parallel(game, n_workers=2)
+        assert stats["best_action_visits"] == stats["root_visits"]
+    finally:
+        mcts.close()
+
+
 def test_adapter_weight_save_load_roundtrip(tmp_path) -> None:
     adapter = SatellitesAdapter()
     adapter.set_weight("move_bot_capture", 9.25)
@@ -233,6 +428,62 @@ def test_adapter_weight_save_load_roundtrip(tmp_path) -> None:
     assert abs(adapter2.get_weights()["move_bot_capture"] - 9.25) < 1e-9
 
 
+class _GridOnlyView:
+    """Just the grid-level API, so adapter helpers take their generic (non-cache) path."""
+
+    def __init__(self, game: SatellitesGame) -> None:
+        self.grid = game.grid
+        self.get_hex_distance = game.get_hex_distance
+        self.get_hex_neighbors = game.get_hex_neighbors
+
+
+def _random_positions(count: int, moves: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        game = SatellitesGame(headless=True)
+        for _ in range(moves):
+            actions = game.legal_actions()
+            if game.state == "GAME_OVER" or not actions:
+                break
+            game.apply_action(rng.choice(actions))
+        yield game
+
+
+def test_adapter_unit_helpers_match_grid_scan() -> None:
+    adapter = SatellitesAdapter()
+    for game in _random_positions(count=8, moves=60, seed=3):
+        view = _GridOnlyView(game)
+        for owner in (0, 1):
+            for utype in ("bot", "tank"):
+                assert sorted(adapter._unit_cells(game, owner, utype)) == sorted(
+                    adapter._unit_cells(view, owner, utype)
+                )
+            # An off-board artefact gives -1 on both paths (99 if the owner has no bots).
+            for artefact in game.artefacts + [(0, 0), (9, 9)]:
+                assert adapter._min_bot_dist(game, owner, artefact) == adapter._min_bot_dist(view, owner, artefact)
+
+
+def test_adapter_adjacent_enemy_tank_matches_grid_scan() -> None:
+    adapter = SatellitesAdapter()
+    seen = set()
+    for game in _random_positions(count=8, moves=60, seed=5):
+        view = _GridOnlyView(game)
+        for owner in (0, 1):
+            for pos in list(game.cell_id_to_coord) + [(-1, 0), (4, 12), (9, 3)]:
+                fast = adapter._is_adj_enemy_tank(game, owner, pos)
+                assert fast == adapter._is_adj_enemy_tank(view, owner, pos)
+                seen.add(fast)
+    # Both outcomes must actually occur for the comparison to mean anything.
+    assert seen == {True, False}
+
+    game = SatellitesGame(headless=True)
+    game.grid = {(4, 5): {"owner": 1, "type": "tank", "count": 1}}
+    assert adapter._is_adj_enemy_tank(game, 0, (4, 4)) is True
+    assert adapter._is_adj_enemy_tank(game, 0, (4, 7)) is False
+    assert adapter._is_adj_enemy_tank(game, 1, (4, 4)) is False
+    assert adapter._is_adj_enemy_tank(game, 0, (9, 9)) is False
+
+
 def test_adapter_is_heuristic_neutral() -> None:
     game = SatellitesGame(headless=True)
     adapter = SatellitesAdapter()
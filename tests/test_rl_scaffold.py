@@ -1,7 +1,9 @@
+import random
+
 import numpy as np
 import pytest
 
-from agents.alpha_mcts import AlphaMCTS
+from agents.alpha_mcts import AlphaMCTS, _root_parallel_worker
 from engine import SatellitesGame
 from rl.action_space import GlobalActionSpace
 from rl.encode import FeatureEncoder
@@ -58,3 +60,79 @@ def test_alpha_mcts_and_selfplay_smoke() -> None:
     assert examples[0].policy.shape == (action_space.size,)
     assert -1.0 <= examples[0].value <= 1.0
 
+
+def test_alpha_mcts_batched_search_reverts_virtual_loss() -> None:
+    game = SatellitesGame(headless=True)
+    action_space = GlobalActionSpace(game)
+    enc = FeatureEncoder(game)
+    model = SatellitesPolicyValueNet(enc.feature_dim, action_space.size)
+    mcts = AlphaMCTS(model, action_space, enc, simulations=20, batch_size=6, seed=1)
+
+    root, pi = mcts.search(game)
+    assert sum(root.visit_count.values()) == 20
+    assert root.visits == 20
+    assert abs(float(pi.sum()) - 1.0) < 1e-5
+
+
+def test_alpha_mcts_reuses_subtree_of_chosen_action() -> None:
+    game = SatellitesGame(headless=True)
+    action_space = GlobalActionSpace(game)
+    enc = FeatureEncoder(game)
+    model = SatellitesPolicyValueNet(enc.feature_dim, action_space.size)
+    mcts = AlphaMCTS(model, action_space, enc, simulations=32, seed=1)
+
+    action, _ = mcts.select_action(game, temperature=1.0)
+    kept = mcts._root
+    assert kept is not None
+    carried = kept.visits
+    assert game.apply_action(action) is True
+
+    root, _ = mcts.search(game)
+    assert root is kept
+    assert root.visits == carried + 32
+
+
+def _mid_game(moves: int = 12) -> SatellitesGame:
+    game = SatellitesGame(headless=True)
+    rng = random.Random(2)
+    for _ in range(moves):
+        game.apply_action(rng.choice(game.legal_actions()))
+    return game
+
+
+def test_alpha_mcts_root_parallel_merges_worker_counts() -> None:
+    game = _mid_game()
+    action_space = GlobalActionSpace(game)
+    enc = FeatureEncoder(game)
+    model = SatellitesPolicyValueNet(enc.feature_dim, action_space.size, hidden_dim=16)
+    mcts = AlphaMCTS(model, action_space, enc, simulations=12, seed=1)
+
+    merged, pi = mcts.search_root_parallel(game, n_workers=2)
+
+    assert sum(merged.values()) == 2 * 12
+    # Workers are seeded from the parent's rng; each must match a serial search with its seed.
+    seed_rng = random.Random(1)
+    expected: dict = {}
+    for seed in [seed_rng.randrange(2**31) for _ in range(2)]:
+        root, _ = AlphaMCTS(model, action_space, enc, simulations=12, seed=seed).search(game)
+        for a, n in root.visit_count.items():
+            expected[a] = expected.get(a, 0) + n
+    assert merged == expected
+    legal = set(action_space.legal_action_indices(game))
+    assert set(merged) <= legal
+    assert abs(float(pi.sum()) - 1.0) < 1e-5
+    assert set(np.flatnonzero(pi).tolist()) <= legal
+
+
+def test_alpha_mcts_root_parallel_worker_matches_serial_search() -> None:
+    game = _mid_game()
+    action_space = GlobalActionSpace(game)
+    enc = FeatureEncoder(game)
+    model = SatellitesPolicyValueNet(enc.feature_dim, action_space.size, hidden_dim=16)
+    parent = AlphaMCTS(model, action_space, enc, simulations=16, batch_size=4, seed=1)
+
+    counts = _root_parallel_worker((model, action_space.max_move_amount, parent._search_kwargs, game, 7))
+
+    serial = AlphaMCTS(model, action_space, enc, simulations=16, batch_size=4, seed=7)
+    root, _ = serial.search(game)
+    assert counts == root.visit_count